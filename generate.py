@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""Generates random puzzle inputs of arbitrary size, for benchmarking how the
+solvers scale.
+
+Each day has a single size parameter (see `GENERATORS` for what it means), and
+the same (day, size, seed) always produces the same input.
+"""
+
+import argparse
+import itertools
+import math
+import random
+import string
+from typing import Callable, Dict, List, NamedTuple, Sequence, Set, Tuple
+
+
+class Generator(NamedTuple):
+    func: Callable[[int, random.Random], List[str]]
+    # what the size parameter controls
+    unit: str
+    # default sizes for `run.py --scale`, chosen so the whole ladder runs in a
+    # reasonable amount of time
+    sizes: Sequence[int]
+
+
+def day1(size: int, rng: random.Random) -> List[str]:
+    depth = rng.randrange(100, 200)
+    lines = []
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-10, 15))
+        lines.append(str(depth))
+    return lines
+
+
+def day2(size: int, rng: random.Random) -> List[str]:
+    directions = ["forward", "down", "up"]
+    return [f"{rng.choice(directions)} {rng.randint(1, 9)}" for _ in range(size)]
+
+
+def day3(size: int, rng: random.Random) -> List[str]:
+    # the ratings in part 2 need every report to be unique
+    width = max(12, math.ceil(math.log2(size)) + 1)
+    return [f"{x:0{width}b}" for x in rng.sample(range(2**width), size)]
+
+
+def day4(size: int, rng: random.Random) -> List[str]:
+    numbers = list(range(100))
+    order = numbers.copy()
+    rng.shuffle(order)
+    lines = [",".join(map(str, order))]
+    for _ in range(size):
+        cells = rng.sample(numbers, 25)
+        lines.append("")
+        for row in range(5):
+            lines.append(" ".join(f"{x:2d}" for x in cells[row * 5 : row * 5 + 5]))
+    return lines
+
+
+def day5(size: int, rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(size):
+        x1, y1 = rng.randrange(1000), rng.randrange(1000)
+        length = rng.randrange(1, 500)
+        dx, dy = rng.choice([(1, 0), (0, 1), (1, 1), (1, -1)])
+        if rng.random() < 0.5:
+            dx, dy = -dx, -dy
+        x2 = min(max(x1 + dx * length, 0), 999)
+        y2 = min(max(y1 + dy * length, 0), 999)
+        if dx and dy:
+            # keep diagonals at exactly 45 degrees after clamping
+            length = min(abs(x2 - x1), abs(y2 - y1))
+            x2, y2 = x1 + dx * length, y1 + dy * length
+        lines.append(f"{x1},{y1} -> {x2},{y2}")
+    return lines
+
+
+def day6(size: int, rng: random.Random) -> List[str]:
+    return [",".join(str(rng.randint(1, 5)) for _ in range(size))]
+
+
+def day7(size: int, rng: random.Random) -> List[str]:
+    spread = max(size, 2000)
+    return [",".join(str(int(rng.expovariate(5 / spread))) for _ in range(size))]
+
+
+SEGMENTS = [
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+]
+
+
+def day8(size: int, rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(size):
+        wires = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def scramble(digit: int) -> str:
+            segments = [wires[s] for s in SEGMENTS[digit]]
+            rng.shuffle(segments)
+            return "".join(segments)
+
+        patterns = [scramble(d) for d in rng.sample(range(10), 10)]
+        digits = [scramble(rng.randrange(10)) for _ in range(4)]
+        lines.append(f"{' '.join(patterns)} | {' '.join(digits)}")
+    return lines
+
+
+def digit_grid(size: int, rng: random.Random, digits: str) -> List[str]:
+    return ["".join(rng.choices(digits, k=size)) for _ in range(size)]
+
+
+def day9(size: int, rng: random.Random) -> List[str]:
+    return digit_grid(size, rng, string.digits)
+
+
+def day10(size: int, rng: random.Random) -> List[str]:
+    pairs = {"(": ")", "[": "]", "{": "}", "<": ">"}
+    lines = []
+    for i in range(size):
+        stack: List[str] = []
+        chars = []
+        for _ in range(rng.randrange(20, 110)):
+            if stack and rng.random() < 0.45:
+                chars.append(pairs[stack.pop()])
+            else:
+                opener = rng.choice(list(pairs))
+                stack.append(opener)
+                chars.append(opener)
+        # part 2 needs at least one incomplete line, so only corrupt every other
+        if i % 2 and stack:
+            wrong = [c for c in pairs.values() if c != pairs[stack[-1]]]
+            chars.append(rng.choice(wrong))
+        lines.append("".join(chars))
+    return lines
+
+
+# grids that synchronize at all do so within about 40 steps, and the rest don't
+# within 1000, so there's no point in simulating them for long
+OCTOPUS_SYNC_STEPS = 100
+OCTOPUS_ATTEMPTS = 10
+
+
+def day11(size: int, rng: random.Random) -> List[str]:
+    # Part 2 waits for every octopus to flash at once, which grids of uniformly
+    # random digits usually never do. Starting them all at 4-9 makes it much
+    # more likely (about 9 in 10), and we check that it actually happens before
+    # returning.
+    for _ in range(OCTOPUS_ATTEMPTS):
+        lines = digit_grid(size, rng, "456789")
+        if octopuses_sync(lines, max_steps=OCTOPUS_SYNC_STEPS):
+            return lines
+    raise ValueError(
+        f"none of {OCTOPUS_ATTEMPTS} random {size}x{size} grids of octopuses"
+        f" synchronized within {OCTOPUS_SYNC_STEPS} steps"
+    )
+
+
+def octopuses_sync(lines: List[str], max_steps: int) -> bool:
+    size = len(lines)
+    energy = [[int(c) for c in line] for line in lines]
+    for _ in range(max_steps):
+        to_flash = []
+        for y in range(size):
+            for x in range(size):
+                energy[y][x] += 1
+                if energy[y][x] == 10:
+                    to_flash.append((y, x))
+        flashes = 0
+        while to_flash:
+            y, x = to_flash.pop()
+            flashes += 1
+            for ny in range(max(y - 1, 0), min(y + 2, size)):
+                for nx in range(max(x - 1, 0), min(x + 2, size)):
+                    energy[ny][nx] += 1
+                    if energy[ny][nx] == 10:
+                        to_flash.append((ny, nx))
+        if flashes == size * size:
+            return True
+        for row in energy:
+            for x, value in enumerate(row):
+                if value > 9:
+                    row[x] = 0
+    return False
+
+
+def day12(size: int, rng: random.Random) -> List[str]:
+    """`size` small caves, with a big cave for every three small ones.
+
+    Big caves are never connected to each other, since that would make the
+    number of paths infinite.
+    """
+    small = [f"s{i}" for i in range(size)]
+    big = [f"B{i}" for i in range(max(1, size // 3))]
+    edges = set()
+    for cave in small:
+        edges.add((cave, rng.choice(big)))
+    for a, b in itertools.combinations(small, 2):
+        if rng.random() < 2 / size:
+            edges.add((a, b))
+    for cave in rng.sample(small, min(2, size)):
+        edges.add(("start", cave))
+    for cave in rng.sample(small, min(2, size)):
+        edges.add((cave, "end"))
+    edges.add(("start", big[0]))
+    edges.add((big[-1], "end"))
+    return [f"{a}-{b}" for a, b in sorted(edges)]
+
+
+def day13(size: int, rng: random.Random) -> List[str]:
+    # Each fold is at least twice as far out as the next one, so unfolding a
+    # dot in the final area never puts it on an earlier fold line.
+    x_levels, y_levels = 5, 7
+    while size > (41 << x_levels) * (7 << y_levels) // 10:
+        x_levels += 1
+        y_levels += 1
+    x_folds = [(41 << i) - 1 for i in reversed(range(x_levels))]
+    y_folds = [(7 << i) - 1 for i in reversed(range(y_levels))]
+
+    dots: Set[Tuple[int, int]] = set()
+    while len(dots) < size:
+        x, y = rng.randrange(40), rng.randrange(6)
+        for fold in reversed(x_folds):
+            if rng.random() < 0.5:
+                x = 2 * fold - x
+        for fold in reversed(y_folds):
+            if rng.random() < 0.5:
+                y = 2 * fold - y
+        dots.add((x, y))
+    lines = [f"{x},{y}" for x, y in dots]
+    lines.append("")
+    folds = [f"fold along x={p}" for p in x_folds]
+    folds.extend(f"fold along y={p}" for p in y_folds)
+    lines.extend(folds)
+    return lines
+
+
+def day14(size: int, rng: random.Random) -> List[str]:
+    elements = "BCFHKNOPSV"
+    lines = ["".join(rng.choices(elements, k=size)), ""]
+    for pair in itertools.product(elements, repeat=2):
+        lines.append(f"{''.join(pair)} -> {rng.choice(elements)}")
+    return lines
+
+
+def day15(size: int, rng: random.Random) -> List[str]:
+    return digit_grid(size, rng, "123456789")
+
+
+def day16(size: int, rng: random.Random) -> List[str]:
+    """A packet tree with `size` packets in total."""
+    depth_limit = max(2, math.ceil(math.log2(size + 1)))
+
+    def bits(value: int, width: int) -> str:
+        return f"{value:0{width}b}"
+
+    def packet(count: int, depth: int) -> str:
+        version = bits(rng.randrange(8), 3)
+        if count == 1 or depth >= depth_limit:
+            value = rng.randrange(1 << rng.randrange(1, 20))
+            num_groups = max(1, math.ceil(value.bit_length() / 4))
+            body = "".join(
+                ("1" if i < num_groups - 1 else "0")
+                + bits(value >> (4 * (num_groups - 1 - i)) & 0xF, 4)
+                for i in range(num_groups)
+            )
+            return version + bits(4, 3) + body
+        count -= 1
+        if count >= 2 and rng.random() < 0.2:
+            type_id = rng.choice([5, 6, 7])
+            split = rng.randint(1, count - 1)
+            counts = [split, count - split]
+        else:
+            type_id = rng.choice([0, 1, 2, 3])
+            children = rng.randint(1, min(count, 5))
+            cuts = sorted(rng.sample(range(1, count), children - 1))
+            counts = [b - a for a, b in zip([0, *cuts], [*cuts, count])]
+        subpackets = "".join(packet(c, depth + 1) for c in counts)
+        if len(counts) < (1 << 11) and (
+            len(subpackets) >= (1 << 15) or rng.random() < 0.5
+        ):
+            header = "1" + bits(len(counts), 11)
+        else:
+            header = "0" + bits(len(subpackets), 15)
+        return version + bits(type_id, 3) + header + subpackets
+
+    data = packet(size, 0)
+    data += "0" * (-len(data) % 8)
+    return [f"{int(data, 2):0{len(data) // 4}X}"]
+
+
+def day17(size: int, rng: random.Random) -> List[str]:
+    x_min = size + rng.randrange(size // 2 + 1)
+    y_max = -size + rng.randrange(size // 2 + 1)
+    return [
+        f"target area: x={x_min}..{x_min + size // 2}, y={y_max - size // 2}..{y_max}"
+    ]
+
+
+def day18(size: int, rng: random.Random) -> List[str]:
+    def number(depth: int) -> str:
+        # values nested inside four pairs would need to explode
+        if depth == 4 or (depth > 0 and rng.random() < 0.3):
+            return str(rng.randrange(10))
+        return f"[{number(depth + 1)},{number(depth + 1)}]"
+
+    return [number(0) for _ in range(size)]
+
+
+def day19(size: int, rng: random.Random) -> List[str]:
+    """`size` scanners (at least 5), placed in a chain so that each one shares at
+    least 12 beacons with the previous one."""
+    size = max(size, 5)
+    rotations = [
+        m
+        for m in itertools.product(
+            itertools.permutations(range(3)), itertools.product([-1, 1], repeat=3)
+        )
+        # only proper rotations, not reflections
+        if permutation_sign(m[0]) * math.prod(m[1]) == 1
+    ]
+    positions: List[Tuple[int, ...]] = [(0, 0, 0)]
+    for _ in range(size - 1):
+        axis = rng.randrange(3)
+        positions.append(
+            tuple(
+                p + (rng.randint(1000, 1100) if i == axis else rng.randint(-100, 100))
+                for i, p in enumerate(positions[-1])
+            )
+        )
+
+    beacons = place_beacons(positions, rng)
+    visible = [
+        [b for b in sorted(beacons) if all(abs(x - p) <= 1000 for x, p in zip(b, pos))]
+        for pos in positions
+    ]
+    assert scanners_connected(visible), "some scanners can't be placed"
+
+    lines = []
+    for s, (position, seen) in enumerate(zip(positions, visible)):
+        axes, signs = rng.choice(rotations)
+        lines.append(f"--- scanner {s} ---")
+        rng.shuffle(seen)
+        for beacon in seen:
+            offset = [b - p for b, p in zip(beacon, position)]
+            lines.append(",".join(str(signs[i] * offset[axes[i]]) for i in range(3)))
+        lines.append("")
+    return lines[:-1]
+
+
+def place_beacons(
+    positions: List[Tuple[int, ...]], rng: random.Random
+) -> Set[Tuple[int, ...]]:
+    """Scatters some beacons around each scanner, and makes sure there are at
+    least 12 in the region that each pair of neighbouring scanners can see."""
+    beacons: Set[Tuple[int, ...]] = set()
+    for s, position in enumerate(positions):
+        for _ in range(rng.randint(8, 14)):
+            beacons.add(tuple(p + rng.randint(-1000, 1000) for p in position))
+        if not s:
+            continue
+        # the region both this scanner and the previous one can see
+        lo = [max(a, b) - 1000 for a, b in zip(positions[s - 1], position)]
+        hi = [min(a, b) + 1000 for a, b in zip(positions[s - 1], position)]
+        shared = rng.randint(12, 16)
+        while sum(1 for b in beacons if in_region(b, lo, hi)) < shared:
+            beacons.add(tuple(rng.randint(l, h) for l, h in zip(lo, hi)))
+    return beacons
+
+
+def in_region(point: Tuple[int, ...], lo: List[int], hi: List[int]) -> bool:
+    return all(l <= x <= h for x, l, h in zip(point, lo, hi))
+
+
+def scanners_connected(visible: List[List[Tuple[int, ...]]]) -> bool:
+    """Checks that every scanner can be reached from scanner 0 through pairs that
+    see at least 12 of the same beacons."""
+    seen_sets = [set(beacons) for beacons in visible]
+    reached = {0}
+    stack = [0]
+    while stack:
+        s = stack.pop()
+        for t, beacons in enumerate(seen_sets):
+            if t not in reached and len(seen_sets[s] & beacons) >= 12:
+                reached.add(t)
+                stack.append(t)
+    return len(reached) == len(visible)
+
+
+def permutation_sign(perm: Tuple[int, ...]) -> int:
+    inversions = sum(
+        1 for i, j in itertools.combinations(range(len(perm)), 2) if perm[i] > perm[j]
+    )
+    return -1 if inversions % 2 else 1
+
+
+def day20(size: int, rng: random.Random) -> List[str]:
+    lut = rng.choices("#.", k=512)
+    if lut[0] == "#":
+        # otherwise the infinite background would stay lit
+        lut[511] = "."
+    return ["".join(lut), "", *digit_grid(size, rng, "#.")]
+
+
+def day21(_size: int, rng: random.Random) -> List[str]:
+    return [
+        f"Player 1 starting position: {rng.randint(1, 10)}",
+        f"Player 2 starting position: {rng.randint(1, 10)}",
+    ]
+
+
+def day22(size: int, rng: random.Random) -> List[str]:
+    """`size` reboot steps; the first 20 are inside the initialization region."""
+
+    def cuboid(extent: int, max_length: int) -> str:
+        ranges = []
+        for axis in "xyz":
+            lo = rng.randint(-extent, extent - 1)
+            hi = min(lo + rng.randint(1, max_length), extent)
+            ranges.append(f"{axis}={lo}..{hi}")
+        return ",".join(ranges)
+
+    lines = []
+    for i in range(size):
+        state = "on" if i < 10 or rng.random() < 0.6 else "off"
+        if i < 20:
+            lines.append(f"{state} {cuboid(50, 50)}")
+        else:
+            lines.append(f"{state} {cuboid(100000, 40000)}")
+    return lines
+
+
+GENERATORS: Dict[int, Generator] = {
+    1: Generator(day1, "readings", [10**k for k in range(3, 7)]),
+    2: Generator(day2, "commands", [10**k for k in range(3, 7)]),
+    3: Generator(day3, "reports", [10**k for k in range(3, 6)]),
+    4: Generator(day4, "boards", [100, 300, 1000, 3000, 10000]),
+    5: Generator(day5, "lines", [100, 300, 1000, 3000]),
+    6: Generator(day6, "fish", [10**k for k in range(2, 6)]),
+    7: Generator(day7, "crabs", [10**k for k in range(3, 7)]),
+    8: Generator(day8, "entries", [100, 300, 1000, 3000, 10000]),
+    9: Generator(day9, "grid side", [100, 200, 400, 800]),
+    10: Generator(day10, "lines", [100, 300, 1000, 3000, 10000]),
+    11: Generator(day11, "grid side", [25, 50, 100, 200]),
+    12: Generator(day12, "small caves", [4, 5, 6, 7]),
+    13: Generator(day13, "dots", [1000, 3000, 10000, 30000]),
+    14: Generator(day14, "template length", [100, 1000, 10000, 100000]),
+    15: Generator(day15, "grid side", [25, 50, 100]),
+    16: Generator(day16, "packets", [100, 300, 1000, 3000]),
+    17: Generator(day17, "target distance", [50, 100, 200]),
+    18: Generator(day18, "numbers", [10, 20, 40]),
+    19: Generator(day19, "scanners", [5, 10, 20, 40]),
+    20: Generator(day20, "image side", [25, 50, 100, 200]),
+    21: Generator(day21, "(unused)", []),
+    22: Generator(day22, "reboot steps", [50, 100, 200, 400]),
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> List[str]:
+    """Returns the lines of a random input for `day`."""
+    return GENERATORS[day].func(size, random.Random(f"{day}:{size}:{seed}"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("\n".join(generate(args.day, args.size, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,39 @@
 #!/usr/bin/env python3
 
 import argparse
+import builtins
+import contextlib
 import datetime
+import glob
+import hashlib
 import importlib
+import json
 import math
+import numbers
+import os
+import platform
 import statistics
 import sys
+import time
 import timeit
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import mmap
+    import pstats
 
 ROOT = Path(__file__).parent.resolve()
 TODAY = min(datetime.datetime.now(), datetime.datetime(2021, 12, 25)).day
@@ -43,6 +68,204 @@ def main() -> None:
         help="override the input file",
     )
     parser.add_argument("-t", "--timeit", action="store_true", help="time each part")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        type=int,
+        nargs="?",
+        const=os.cpu_count(),
+        help="run days in parallel with N worker processes (defaults to the CPU count)",
+    )
+    parser.add_argument(
+        "--split-parts",
+        action="store_true",
+        help="with -j/--jobs, run the two parts of each day as separate tasks",
+    )
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help="report how long each day module takes to import in a fresh interpreter",
+    )
+    parser.add_argument(
+        "-m",
+        "--memory",
+        action="store_true",
+        help="report the peak memory use and top allocations of each part",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "line"],
+        help="profile each part with cProfile, or line-profile the functions"
+        " marked with @profile in the day modules",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="report the phase times and counters recorded by the solvers (see"
+        " src/instrument.py)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        metavar="dir",
+        type=Path,
+        default=ROOT / "profile",
+        help="where to write the profiles (default: profile/)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="cache",
+        help="always recompute the answers, instead of using the answer cache",
+    )
+    parser.add_argument(
+        "--cache-size",
+        metavar="MiB",
+        type=float,
+        default=16,
+        help="maximum size of the answer cache (default: %(default)s MiB)",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="dir_or_glob",
+        help="run a single day on every input file in a directory (or matching a"
+        " glob), in parallel",
+    )
+    parser.add_argument(
+        "-c",
+        "--check",
+        action="store_true",
+        help="check the answers for both the example and real inputs against"
+        " answers.json (add -t/--timeit to benchmark them afterwards)",
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="with -c/--check, save the current answers to answers.json",
+    )
+    parser.add_argument(
+        "--scale",
+        action="store_true",
+        help="time a single day on generated inputs of increasing size, and"
+        " estimate how the run time grows",
+    )
+    parser.add_argument(
+        "--sizes",
+        metavar="N,N,...",
+        type=lambda s: [int(x) for x in s.split(",")],
+        help="input sizes for --scale (see generate.py for what they mean)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="random seed for the --scale inputs (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--variants",
+        action="store_true",
+        help="check that every registered variant of each part gives the same"
+        " answer, and compare their timings",
+    )
+    server_group = parser.add_mutually_exclusive_group()
+    server_group.add_argument(
+        "--serve",
+        metavar="socket",
+        type=Path,
+        help="keep a warm worker running on a Unix socket, instead of running"
+        " anything directly",
+    )
+    server_group.add_argument(
+        "--connect",
+        metavar="socket",
+        type=Path,
+        help="run the days on the worker started by --serve",
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="with -t/--timeit, time each part in a fresh subprocess",
+    )
+    parser.add_argument(
+        "--rounds",
+        metavar="N",
+        type=int,
+        default=10,
+        help="number of timed rounds for --isolate (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--warmup",
+        metavar="N",
+        type=int,
+        default=1,
+        help="number of untimed rounds to run first for --isolate"
+        " (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cpu",
+        metavar="N",
+        type=int,
+        help="pin the --isolate subprocesses to a single CPU",
+    )
+    parser.add_argument(
+        "--time-limit",
+        metavar="seconds",
+        type=float,
+        help="stop any part that runs for longer than this, and go on to the next one"
+        " (each part runs in its own subprocess)",
+    )
+    parser.add_argument(
+        "--mem-limit",
+        metavar="MiB",
+        type=float,
+        help="stop any part whose resident memory grows past this, and go on to the"
+        " next one (each part runs in its own subprocess)",
+    )
+    parser.add_argument(
+        "--part-child",
+        nargs=3,
+        metavar=("DAY", "PART", "PATH"),
+        help=argparse.SUPPRESS,
+    )
+    parser.add_argument(
+        "--bench-child",
+        nargs=3,
+        metavar=("DAY", "KEY", "PATH"),
+        help=argparse.SUPPRESS,
+    )
+    parser.add_argument(
+        "--json",
+        metavar="file",
+        type=Path,
+        help="with -t/--timeit or -m/--memory, write the results to a JSON file",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="baseline",
+        type=Path,
+        help="with -t/--timeit, compare the timings against a JSON file written by"
+        " --json, and exit with an error if any part got slower",
+    )
+    parser.add_argument(
+        "--threshold",
+        metavar="fraction",
+        type=float,
+        default=0.1,
+        help="relative slowdown that --compare reports as a regression"
+        " (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="with -t/--timeit, append the timings to history.jsonl, tagged with the"
+        " current git commit",
+    )
+    parser.add_argument(
+        "--history-report",
+        action="store_true",
+        help="show how the timings in history.jsonl changed across commits, and"
+        " which commits made each part slower (by more than --threshold)",
+    )
     parser.add_argument(
         "day",
         nargs=argparse.ZERO_OR_MORE,
@@ -50,44 +273,967 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    if args.bench_child is not None:
+        n, key, path = args.bench_child
+        bench_child(int(n), key, Path(path), args.rounds, args.warmup, args.cpu)
+        return
+
+    if args.part_child is not None:
+        n, part, path = args.part_child
+        part_child(int(n), int(part), Path(path))
+        return
+
+    if args.serve is not None:
+        serve(args.serve)
+        return
+
     if args.all:
-        days = list(range(1, TODAY + 1))
+        days = [
+            n for n in range(1, TODAY + 1) if (ROOT / "src" / f"day{n}.py").exists()
+        ]
     elif args.day:
         days = [int(x) for x in args.day]
     else:
         days = [TODAY]
 
+    if args.history_report:
+        show_history(
+            HISTORY_PATH, args.threshold, days if args.all or args.day else None
+        )
+        return
+
     if len(days) > 1 and args.input is not None:
         parser.error("-i/--input cannot be used if multiple days are specified")
 
-    for i, n in enumerate(days):
-        file = args.input
-        if file is None:
-            file = open(  # pylint: disable=consider-using-with
-                ROOT / args.input_dir / f"day{n}.txt", "r"
+    if args.json is not None and not (args.timeit or args.memory):
+        parser.error("--json requires -t/--timeit or -m/--memory")
+    if args.history and not args.timeit:
+        parser.error("--history requires -t/--timeit")
+    if args.compare is not None and not args.timeit:
+        parser.error("--compare requires -t/--timeit")
+    if args.isolate and not args.timeit:
+        parser.error("--isolate requires -t/--timeit")
+    if args.isolate and args.input is not None and args.input.name == "<stdin>":
+        parser.error("--isolate needs an input file, not stdin")
+    if args.rounds < 3:
+        parser.error("--rounds must be at least 3")
+    limited = args.time_limit is not None or args.mem_limit is not None
+    if limited:
+        if args.input is not None and args.input.name == "<stdin>":
+            parser.error("--time-limit and --mem-limit need an input file, not stdin")
+        if (
+            args.timeit
+            or args.memory
+            or args.profile
+            or args.trace
+            or args.jobs is not None
+            or args.connect is not None
+            or args.batch is not None
+            or args.check
+            or args.scale
+            or args.variants
+        ):
+            parser.error(
+                "--time-limit and --mem-limit can only be used when running days"
+                " sequentially, without measuring them"
             )
-        try:
-            lines = file.read().splitlines(keepends=False)
-        finally:
-            file.close()
+
+    if args.scale:
+        if len(days) > 1:
+            parser.error("--scale needs exactly one day")
+        if (
+            args.input is not None
+            or args.timeit
+            or args.memory
+            or args.profile
+            or args.trace
+            or args.import_time
+            or args.jobs is not None
+            or args.connect is not None
+            or args.batch is not None
+            or args.check
+            or args.variants
+        ):
+            parser.error(
+                "--scale does its own timing on generated inputs, so it can't be"
+                " used with -i/--input, -t/--timeit, -m/--memory, --profile,"
+                " --trace, --import-time, -j/--jobs, --connect, --batch, -c/--check"
+                " or --variants"
+            )
+        # pylint: disable-next=import-outside-toplevel
+        from generate import GENERATORS
+
+        if days[0] not in GENERATORS:
+            parser.error(f"there is no input generator for day {days[0]}")
+        sizes = args.sizes or GENERATORS[days[0]].sizes
+        if len(sizes) < 2:
+            parser.error(f"day {days[0]} needs at least two --sizes to scale")
+        run_scale(days[0], sizes, args.seed)
+        return
+
+    if args.variants:
+        if args.jobs is not None or args.connect is not None or args.check:
+            parser.error("--variants cannot be used with -j/--jobs, --connect or -c")
+        if (
+            args.timeit
+            or args.memory
+            or args.profile
+            or args.trace
+            or args.import_time
+            or args.batch is not None
+        ):
+            parser.error(
+                "--variants does its own timing, so it can't be used with"
+                " -t/--timeit, -m/--memory, --profile, --trace, --import-time or"
+                " --batch"
+            )
+        if not run_variants(days, args):
+            sys.exit(1)
+        return
+
+    if args.batch is not None:
+        if len(days) > 1 or args.input is not None:
+            parser.error("--batch needs exactly one day, and no -i/--input")
+        if (
+            args.timeit
+            or args.memory
+            or args.profile
+            or args.trace
+            or args.connect
+            or args.check
+        ):
+            parser.error(
+                "-t/--timeit, -m/--memory, --profile, --trace, --connect and"
+                " -c/--check cannot be used with --batch"
+            )
+        paths = batch_inputs(args.batch)
+        if not paths:
+            parser.error(f"no input files found for --batch {args.batch}")
+        run_batch(days[0], paths, args.jobs or os.cpu_count() or 1)
+        return
+
+    line_profiler = None
+    if args.profile is not None:
+        args.profile_dir.mkdir(parents=True, exist_ok=True)
+    if args.profile == "line":
+        line_profiler = install_line_profiler()
+        if line_profiler is None:
+            parser.error("--profile line requires the line_profiler package")
+    if args.trace:
+        # this also has to happen before the day modules are imported (including
+        # by -c/--check)
+        import instrument  # pylint: disable=import-outside-toplevel
+
+        instrument.enable()
+
+    if args.record and not args.check:
+        parser.error("--record requires -c/--check")
+    if args.check:
+        if args.input is not None:
+            parser.error("-c/--check always uses the example and real inputs")
+        if args.jobs is not None and args.jobs < 1:
+            parser.error("-j/--jobs must be at least 1")
+        if not run_check(days, args.jobs, args.record):
+            sys.exit(1)
+        if not (args.timeit or args.memory or args.profile or args.trace):
+            return
+        print()
+        # don't run the benchmarks in parallel
+        args.jobs = None
+
+    if args.jobs is not None:
+        if args.timeit or args.memory or args.profile or args.trace:
+            parser.error(
+                "-t/--timeit, -m/--memory, --profile and --trace cannot be used with"
+                " -j/--jobs"
+            )
+        if args.jobs < 1:
+            parser.error("-j/--jobs must be at least 1")
+        run_parallel(days, args, get_cache(args))
+        return
+
+    if args.connect is not None:
+        if args.timeit or args.memory or args.profile or args.import_time or args.trace:
+            parser.error("--connect only supports printing the answers")
+        run_client(days, args)
+        return
+
+    # profiling and tracing need the parts to actually run
+    cache = get_cache(args) if args.profile is None and not args.trace else None
+    report = new_report()
+    # hashing a large input can take longer than solving it, so only do it if
+    # something is going to look at the hash
+    needs_hash = (
+        cache is not None
+        or args.json is not None
+        or args.compare is not None
+        or args.history
+    )
+    native_ok = True
+    failed_parts = 0
+    for i, n in enumerate(days):
+        source = read_input(n, args)
 
         day = importlib.import_module(f"day{n}")
+        read = input_reader(day, source)
+        timings: Dict[str, Any] = {}
+        if needs_hash:
+            timings["input_sha256"] = source.sha256()
+        parts = [part for part in (1, 2) if hasattr(day, f"part_{part}")]
+        answers = {}
+        if cache is not None:
+            answers = cache.lookup(n, parts, source.sha256())
+        memory: Dict[str, Any] = {}
+        if args.memory:
+            timings["memory"] = memory
+        traces: Dict[str, Any] = {}
+        if args.trace:
+            timings["trace"] = traces
 
         print(f"Day {n}")
-        if hasattr(day, "part_1"):
-            answer = day.part_1(lines)  # type: ignore
-            print(f"Part 1: {answer}")
-            if args.timeit:
-                get_timing("day.part_1(lines)", globals={**locals(), **globals()})
+        if args.import_time:
+            timings["import"] = get_import_time(n)
+            print(f"Import: {_format_time(timings['import'])}")
+        if not limited and (args.timeit or args.memory or len(answers) < len(parts)):
+            if args.trace:
+                instrument.reset()
+            get_data = parse_input(day, read)
+            if args.trace and hasattr(day, "parse"):
+                traces["parse"] = print_trace("Parse")
+        if args.timeit and hasattr(day, "parse"):
+            print("Parse:")
+            if args.isolate:
+                timings["parse"] = get_isolated_timing(n, "parse", args)
+            else:
+                timings["parse"] = get_timing(
+                    "day.parse(read())", globals={**locals(), **globals()}
+                )
+        if args.memory and hasattr(day, "parse"):
+            if not args.timeit:
+                print("Parse:")
+            memory["parse"] = get_memory(day.parse, read())
 
-        if hasattr(day, "part_2"):
-            answer = day.part_2(lines)  # type: ignore
-            print(f"Part 2: {answer}")
+        results = {}
+        for part in parts:
+            key = f"part_{part}"
+            if part in answers:
+                answer = answers[part]
+            elif limited:
+                status, answer, elapsed = run_limited(
+                    n, part, source.path, args.time_limit, args.mem_limit  # type: ignore
+                )
+                if status != "ok":
+                    print(f"Part {part}: {status}  ({_format_time(elapsed)})")
+                    failed_parts += 1
+                    continue
+                if cache is not None:
+                    cache.put(n, part, source.sha256(), answer)
+            elif args.profile == "cprofile":
+                answer = profile_call(
+                    getattr(day, key), get_data(), args.profile_dir / f"day{n}_{key}"
+                )
+            else:
+                if args.trace:
+                    instrument.reset()
+                answer = getattr(day, key)(get_data())
+                if cache is not None:
+                    cache.put(n, part, source.sha256(), answer)
+            print(f"Part {part}: {answer}")
+            if args.trace:
+                traces[key] = print_trace(f"Part {part}")
+            results[part] = answer
             if args.timeit:
-                get_timing("day.part_2(lines)", globals={**locals(), **globals()})
+                if args.isolate:
+                    timings[key] = get_isolated_timing(n, key, args)
+                else:
+                    timings[key] = get_timing(
+                        f"day.{key}(get_data())", globals={**locals(), **globals()}
+                    )
+            if args.memory:
+                memory[key] = get_memory(getattr(day, key), get_data())
+
+        binary = native_binary(n) if source.path is not None else None
+        if binary is not None:
+            try:
+                native_answers, elapsed = run_native(binary, source.path)  # type: ignore
+                for part, answer in sorted(native_answers.items()):
+                    if part not in results:
+                        status = "unverified"
+                    elif str(_to_json(results[part])) == answer:
+                        status = "ok"
+                    else:
+                        status = "MISMATCH"
+                        native_ok = False
+                    print(
+                        f"Native part {part}: {answer}  {status}"
+                        f"  ({_format_time(elapsed)})"
+                    )
+                if args.timeit:
+                    print("Native (whole program, including startup):")
+                    timings["native"] = get_native_timing(
+                        binary, source.path  # type: ignore
+                    )
+            except NativeError as e:
+                print(f"Native: FAILED ({e})")
+                native_ok = False
+
+        report["days"][str(n)] = timings
+        if i != len(days) - 1:
+            print()
+
+    if cache is not None:
+        print(f"\n{cache.stats()}")
+
+    if line_profiler is not None:
+        if not line_profiler.functions:
+            print("No functions are marked with @profile in the day modules")
+        line_profiler.dump_stats(args.profile_dir / "line.lprof")
+        line_profiler.print_stats(stripzeros=True)
+        print(f"Line profile written to {args.profile_dir / 'line.lprof'}")
+
+    if args.json is not None or args.history:
+        report["numpy"] = numpy_version()
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.history:
+        append_history(HISTORY_PATH, report)
+    if args.compare is not None:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if not compare_timings(baseline, report, args.threshold):
+            sys.exit(1)
+    if not native_ok:
+        sys.exit("Native builds failed, or their answers differ from Python's")
+    if failed_parts:
+        sys.exit(f"{failed_parts} part(s) failed or went over their limits")
+
+
+def input_path(n: int, args: argparse.Namespace) -> Path:
+    if args.input is not None:
+        return Path(args.input.name)
+    return ROOT / args.input_dir / f"day{n}.txt"
+
+
+def read_input(n: int, args: argparse.Namespace) -> "PuzzleInput":
+    if args.input is not None and args.input.name == "<stdin>":
+        return PuzzleInput(text=args.input.read())
+    return PuzzleInput(path=input_path(n, args))
+
+
+# bytes of input to hash at a time
+HASH_BLOCK_SIZE = 1 << 20
+
+
+class PuzzleInput:
+    """A day's input, either a file or some text that's already in memory.
+
+    This only holds the path or the text, so it's cheap to send to another
+    process, and the solvers get it in whatever form they ask for (see
+    input_reader()).
+    """
+
+    def __init__(self, path: Optional[Path] = None, text: Optional[str] = None):
+        self.path = path
+        self.text = text
+        self._sha256: Optional[str] = None
+
+    def lines(self) -> List[str]:
+        if self.text is None:
+            with open(self.path, "r") as f:  # type: ignore
+                return f.read().splitlines(keepends=False)
+        return self.text.splitlines(keepends=False)
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yields the lines one at a time, without reading the whole file."""
+        if self.text is None:
+            with open(self.path, "r") as f:  # type: ignore
+                for line in f:
+                    yield line.rstrip("\n")
+        else:
+            yield from self.text.splitlines(keepends=False)
+
+    def buffer(self) -> Union[bytes, "mmap.mmap"]:
+        """Returns the raw bytes, memory-mapped read-only if they're in a file."""
+        if self.text is None:
+            import mmap  # pylint: disable=import-outside-toplevel
+
+            with open(self.path, "rb") as f:  # type: ignore
+                # empty files can't be mapped
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b""
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.text.encode()
+
+    def sha256(self) -> str:
+        """Hashes the raw bytes of the input.
+
+        This has to read all of it, so it's only worked out when something needs
+        it (the cache or a timing report), and then remembered.
+        """
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            if self.text is None:
+                with open(self.path, "rb") as f:  # type: ignore
+                    while block := f.read(HASH_BLOCK_SIZE):
+                        digest.update(block)
+            else:
+                digest.update(self.text.encode())
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+
+INPUT_TYPES = {
+    "lines": PuzzleInput.lines,
+    "iter": PuzzleInput.iter_lines,
+    "buffer": PuzzleInput.buffer,
+}
+
+
+def input_reader(day: Any, source: PuzzleInput) -> Callable[[], Any]:
+    """Returns a function that gives the raw input in the form the day asks for.
+
+    A day module can set `INPUT_TYPE` to one of:
+      "lines"   a list of lines, without the newlines (the default)
+      "iter"    an iterator over the lines, read from the file as it goes
+      "buffer"  the raw bytes, as a read-only mmap for files
+
+    Lists and buffers are only read on the first call (so nothing is read if
+    every answer is cached) and then shared, but each call gives a new iterator,
+    since they can only be consumed once.
+    """
+    kind = getattr(day, "INPUT_TYPE", "lines")
+    if kind == "iter":
+        return source.iter_lines
+    read = INPUT_TYPES[kind]
+    value: List[Any] = []
+
+    def reader() -> Any:
+        if not value:
+            value.append(read(source))
+        return value[0]
+
+    return reader
+
+
+def parse_input(day: Any, read: Callable[[], Any]) -> Callable[[], Any]:
+    """Returns a function that gives the input for each part of a day.
+
+    If a day module defines `parse(raw)`, it is called once and the result is
+    shared between both parts, so the parts must not modify it (they should make
+    a copy of anything they need to change). Otherwise, the parts get the raw
+    input from `read`.
+    """
+    if hasattr(day, "parse"):
+        data = day.parse(read())
+        return lambda: data
+    return read
+
+
+PartResult = Tuple[int, Any, float]
+
+
+def run_parts(
+    n: int, parts: Sequence[int], source: PuzzleInput
+) -> Tuple[Optional[float], List[PartResult]]:
+    """Runs the given parts of a day, and returns the parse time (or None, if the
+    day has no parser) and (part, answer, wall time) for each part that exists.
+
+    This is the unit of work for the process pool, so it has to be picklable.
+    """
+    day = importlib.import_module(f"day{n}")
+    start = time.perf_counter()
+    get_data = parse_input(day, input_reader(day, source))
+    parse_time = time.perf_counter() - start if hasattr(day, "parse") else None
+    results = []
+    for part in parts:
+        func = getattr(day, f"part_{part}", None)
+        if func is None:
+            continue
+        start = time.perf_counter()
+        answer = func(get_data())
+        results.append((part, answer, time.perf_counter() - start))
+    return parse_time, results
+
+
+def run_parallel(
+    days: List[int], args: argparse.Namespace, cache: Optional["AnswerCache"]
+) -> None:
+    """Dispatches each day (or each part, with --split-parts) to a process pool,
+    and prints the results in day order as soon as they are available.
+
+    Parts with a cached answer aren't dispatched at all.
+    """
+    start = time.perf_counter()
+    # pylint: disable-next=import-outside-toplevel
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        tasks = []
+        for n in days:
+            source = read_input(n, args)
+            parts = [1, 2]
+            answers = {}
+            if cache is not None:
+                day = importlib.import_module(f"day{n}")
+                parts = [part for part in parts if hasattr(day, f"part_{part}")]
+                answers = cache.lookup(n, parts, source.sha256())
+                parts = [part for part in parts if part not in answers]
+            if not parts:
+                futures = []
+            elif args.split_parts:
+                futures = [pool.submit(run_parts, n, (part,), source) for part in parts]
+            else:
+                futures = [pool.submit(run_parts, n, parts, source)]
+            tasks.append((n, source, answers, futures))
+
+        for i, (n, source, answers, futures) in enumerate(tasks):
+            print(f"Day {n}")
+            # (part, answer, wall time or None if cached)
+            results: List[Tuple[int, Any, Optional[float]]] = [
+                (part, answer, None) for part, answer in answers.items()
+            ]
+            for j, future in enumerate(futures):
+                parse_time, new_results = future.result()
+                # with --split-parts, only report the first parse
+                if parse_time is not None and j == 0:
+                    print(f"Parse: {_format_time(parse_time)}")
+                results.extend(new_results)
+                if cache is not None:
+                    for part, answer, _ in new_results:
+                        cache.put(n, part, source.sha256(), answer)
+            for part, answer, elapsed in sorted(results, key=lambda r: r[0]):
+                if elapsed is None:
+                    print(f"Part {part}: {answer}  (cached)")
+                else:
+                    print(f"Part {part}: {answer}  ({_format_time(elapsed)})")
+            if i != len(tasks) - 1:
+                print()
+            sys.stdout.flush()
+
+    print(f"\nTotal wall time: {_format_time(time.perf_counter() - start)}")
+    if cache is not None:
+        print(cache.stats())
+
+
+def get_cache(args: argparse.Namespace) -> Optional["AnswerCache"]:
+    if not args.cache:
+        return None
+    return AnswerCache(ROOT / ".cache" / "answers", int(args.cache_size * 2**20))
+
+
+class AnswerCache:
+    """An on-disk cache of answers, keyed by the input, the part, and the
+    source code that computed it.
+
+    Each answer is stored in its own file, and the least recently used ones are
+    removed once the cache grows past `max_size` bytes.
+    """
+
+    def __init__(self, directory: Path, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._source_hashes: Dict[int, str] = {}
+
+    def source_hash(self, n: int) -> str:
+        """Hashes the day's module, and any shared (non-day) modules in src/ that
+        it might depend on."""
+        if n not in self._source_hashes:
+            src = ROOT / "src"
+            paths = [src / f"day{n}.py"]
+            paths.extend(p for p in sorted(src.glob("*.py")) if p.stem[:3] != "day")
+            digest = hashlib.sha256()
+            for path in paths:
+                digest.update(path.name.encode())
+                digest.update(path.read_bytes())
+            self._source_hashes[n] = digest.hexdigest()
+        return self._source_hashes[n]
+
+    def _path(self, n: int, part: int, input_hash: str) -> Path:
+        key = hashlib.sha256(
+            f"{n}:{part}:{input_hash}:{self.source_hash(n)}".encode()
+        ).hexdigest()
+        return self.directory / f"day{n}_part_{part}_{key[:32]}.json"
+
+    def lookup(self, n: int, parts: List[int], input_hash: str) -> Dict[int, Any]:
+        """Returns the cached answers for any of `parts`."""
+        answers = {}
+        for part in parts:
+            path = self._path(n, part, input_hash)
+            try:
+                with open(path, "r") as f:
+                    answers[part] = json.load(f)["answer"]
+            except (OSError, ValueError, KeyError):
+                self.misses += 1
+                continue
+            self.hits += 1
+            # mark it as recently used
+            os.utime(path)
+        return answers
+
+    def put(self, n: int, part: int, input_hash: str, answer: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(n, part, input_hash)
+        # write to a temporary file first, so readers never see a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"answer": _to_json(answer)}, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def stats(self) -> str:
+        return f"Answer cache: {self.hits} hits, {self.misses} misses"
+
 
+ANSWERS_PATH = ROOT / "answers.json"
+
+
+def run_check(days: List[int], jobs: Optional[int], record: bool) -> bool:
+    """Runs each day on the example and real inputs, and compares the answers
+    with the ones saved in answers.json. The answer cache isn't used, since the
+    point is to actually run the solvers.
+
+    Returns False if any answer is wrong.
+    """
+    try:
+        with open(ANSWERS_PATH, "r") as f:
+            expected: Dict[str, Dict[str, Dict[str, Any]]] = json.load(f)
+    except FileNotFoundError:
+        expected = {}
+
+    paths = [
+        (n, input_dir, ROOT / input_dir / f"day{n}.txt")
+        for n in days
+        for input_dir in ["example", "input"]
+        if (ROOT / input_dir / f"day{n}.txt").exists()
+    ]
+    with contextlib.ExitStack() as stack:
+        if jobs is not None:
+            # pylint: disable-next=import-outside-toplevel
+            import concurrent.futures
+
+            pool = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+            )
+            futures = [pool.submit(run_file, n, path) for n, _, path in paths]
+            outcomes = (future.result() for future in futures)
+        else:
+            outcomes = (run_file(n, path) for n, _, path in paths)
+
+        counts = {"ok": 0, "FAIL": 0, "unrecorded": 0}
+        for (n, input_dir, path), (_, results) in zip(paths, outcomes):
+            for part, answer, elapsed in results:
+                answer = _to_json(answer)
+                recorded = expected.get(str(n), {}).get(input_dir, {})
+                if str(part) not in recorded:
+                    status = "unrecorded"
+                elif recorded[str(part)] == answer:
+                    status = "ok"
+                else:
+                    status = "FAIL"
+                counts[status] += 1
+                message = f"Day {n} {input_dir} part {part}: {status}"
+                if status == "FAIL":
+                    message += f" (got {answer!r}, expected {recorded[str(part)]!r})"
+                print(f"{message}  ({_format_time(elapsed)})", flush=True)
+                # -1 is what the solvers return when they don't have an answer
+                # (e.g. day 19 isn't finished), so it's never the right one
+                if record and answer != -1:
+                    day_answers = expected.setdefault(str(n), {})
+                    day_answers.setdefault(input_dir, {})[str(part)] = answer
+
+            binary = native_binary(n)
+            if binary is None:
+                continue
+            try:
+                native_answers, elapsed = run_native(binary, path)
+            except NativeError as e:
+                counts["FAIL"] += 1
+                print(f"Day {n} {input_dir} (native): FAIL ({e})", flush=True)
+                continue
+            recorded = expected.get(str(n), {}).get(input_dir, {})
+            for part, answer in sorted(native_answers.items()):
+                if str(part) not in recorded:
+                    status = "unrecorded"
+                elif str(recorded[str(part)]) == answer:
+                    status = "ok"
+                else:
+                    status = "FAIL"
+                counts[status] += 1
+                message = f"Day {n} {input_dir} part {part} (native): {status}"
+                if status == "FAIL":
+                    message += f" (got {answer!r}, expected {recorded[str(part)]!r})"
+                print(f"{message}  ({_format_time(elapsed)})", flush=True)
+
+    print(
+        f"\n{counts['ok']} passed, {counts['FAIL']} failed,"
+        f" {counts['unrecorded']} without a recorded answer"
+    )
+    if record:
+        expected = {k: expected[k] for k in sorted(expected, key=int)}
+        with open(ANSWERS_PATH, "w") as f:
+            json.dump(expected, f, indent=2)
+            f.write("\n")
+        print(f"Answers saved to {ANSWERS_PATH.name}")
+        return True
+    return counts["FAIL"] == 0
+
+
+def batch_inputs(pattern: str) -> List[Path]:
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted(p for p in path.iterdir() if p.is_file())
+    return sorted(Path(p) for p in glob.glob(pattern) if Path(p).is_file())
+
+
+def run_file(n: int, path: Path) -> Tuple[Optional[float], List[PartResult]]:
+    return run_parts(n, (1, 2), PuzzleInput(path=path))
+
+
+def run_batch(n: int, paths: List[Path], jobs: int) -> None:
+    """Runs one day on many inputs in a process pool, printing a line for each
+    input as soon as it finishes, then the overall throughput."""
+    # pylint: disable-next=import-outside-toplevel
+    import concurrent.futures
+
+    start = time.perf_counter()
+    solve_total = 0.0
+    failed = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_file, n, path): path for path in paths}
+        for future in concurrent.futures.as_completed(futures):
+            path = futures[future]
+            try:
+                parse_time, results = future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"{path}: {type(e).__name__}: {e}")
+                failed += 1
+                continue
+            answers = ", ".join(
+                f"part {part} = {answer}" for part, answer, _ in results
+            )
+            times = [f"part {part} {_format_time(t)}" for part, _, t in results]
+            if parse_time is not None:
+                times.insert(0, f"parse {_format_time(parse_time)}")
+            print(f"{path}: {answers} ({', '.join(times)})", flush=True)
+            solve_total += (parse_time or 0.0) + sum(t for _, _, t in results)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"\n{len(paths)} inputs ({failed} failed) in {_format_time(elapsed)} with"
+        f" {jobs} workers: {len(paths) / elapsed:.3g} inputs/s,"
+        f" {_format_time(solve_total)} total solve time"
+    )
+
+
+def run_scale(n: int, sizes: Sequence[int], seed: int) -> None:
+    """Times a day on generated inputs of each size, and fits a power law to
+    the results to estimate the empirical complexity of each part."""
+    from generate import GENERATORS, generate  # pylint: disable=import-outside-toplevel
+
+    print(f"Day {n}, size = {GENERATORS[n].unit}")
+    columns = ["parse", "part_1", "part_2"]
+    print(f"{'size':>10}" + "".join(f"{c:>12}" for c in columns))
+    times: Dict[str, List[Tuple[int, float]]] = {c: [] for c in columns}
+    for size in sizes:
+        source = PuzzleInput(text="\n".join(generate(n, size, seed)))
+        best: Dict[str, float] = {}
+        # take the best of 3 runs, unless the part is slow enough that noise
+        # doesn't matter much
+        for _ in range(3):
+            with contextlib.redirect_stdout(sys.stderr):
+                parse_time, results = run_parts(n, (1, 2), source)
+            new = {f"part_{part}": t for part, _, t in results}
+            if parse_time is not None:
+                new["parse"] = parse_time
+            best = {k: min(t, best.get(k, t)) for k, t in new.items()}
+            if sum(new.values()) > 1.0:
+                break
+        row = f"{size:>10}"
+        for c in columns:
+            if c in best:
+                times[c].append((size, best[c]))
+                row += f"{_format_time(best[c]):>12}"
+            else:
+                row += f"{'-':>12}"
+        print(row, flush=True)
+
+    print("\nEstimated exponent (time ~ size^k):")
+    for c in columns:
+        if len(times[c]) >= 2:
+            print(f"  {c}: k = {fit_exponent(times[c]):.2f}")
+
+
+def fit_exponent(points: List[Tuple[int, float]]) -> float:
+    """Least-squares slope of log(time) against log(size)."""
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(t) for _, t in points]
+    x_mean = statistics.mean(xs)
+    y_mean = statistics.mean(ys)
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    denominator = sum((x - x_mean) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def run_variants(days: List[int], args: argparse.Namespace) -> bool:
+    """Runs each part and all of its registered variants (see src/variants.py)
+    on the same input, and prints a table of their best times.
+
+    Returns False if any variant disagrees with the part it replaces.
+    """
+    from variants import get_variants  # pylint: disable=import-outside-toplevel
+
+    ok = True
+    for i, n in enumerate(days):
+        day = importlib.import_module(f"day{n}")
+        get_data = parse_input(day, input_reader(day, read_input(n, args)))
+        registered = get_variants(day.__name__)
+        print(f"Day {n}")
+        print(f"{'part':<6}{'variant':<20}{'best time':>12}{'relative':>10}  answer")
+        for part in (1, 2):
+            if not hasattr(day, f"part_{part}"):
+                continue
+            funcs = {"default": getattr(day, f"part_{part}")}
+            funcs.update(registered.get(part, {}))
+            expected = None
+            baseline = None
+            for name, func in funcs.items():
+                answer = _to_json(func(get_data()))
+                # pylint: disable-next=cell-var-from-loop
+                timer = timeit.Timer(lambda: func(get_data()))
+                num_loops, _ = timer.autorange()
+                best = min(timer.repeat(repeat=5, number=num_loops)) / num_loops
+                if baseline is None:
+                    expected, baseline = answer, best
+                row = (
+                    f"{part:<6}{name:<20}{_format_time(best):>12}"
+                    f"{best / baseline:>9.2f}x  {answer}"
+                )
+                if answer != expected:
+                    row += f"  MISMATCH (expected {expected})"
+                    ok = False
+                print(row)
         if i != len(days) - 1:
             print()
+        sys.stdout.flush()
+    return ok
+
+
+def _to_json(answer: Any) -> Any:
+    # numpy integers aren't JSON serializable
+    if isinstance(answer, numbers.Integral):
+        return int(answer)
+    return str(answer)
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs a single request for the --serve worker.
+
+    Requests have a `day`, an optional `part` (both parts are run if it's
+    missing), and either the `path` to an input file or the `input` itself.
+    """
+    n = int(request["day"])
+    if "input" in request:
+        source = PuzzleInput(text=request["input"])
+    else:
+        source = PuzzleInput(path=Path(request["path"]))
+    parts = [int(request["part"])] if request.get("part") else [1, 2]
+    parse_time, results = run_parts(n, parts, source)
+    return {
+        "day": n,
+        "parse_time": parse_time,
+        "answers": {str(part): _to_json(answer) for part, answer, _ in results},
+        "times": {str(part): elapsed for part, _, elapsed in results},
+    }
+
+
+def serve(path: Path) -> None:
+    """Answers requests on a Unix socket, one JSON object per line, so that
+    each one doesn't pay for starting Python and importing the day modules.
+
+    Requests are handled one at a time, since some of the solvers keep state in
+    module globals.
+    """
+    import socketserver  # pylint: disable=import-outside-toplevel
+    import stat  # pylint: disable=import-outside-toplevel
+
+    # a socket left behind by an earlier server can be replaced, but nothing else
+    try:
+        mode = path.lstat().st_mode
+    except FileNotFoundError:
+        pass
+    else:
+        if not stat.S_ISSOCK(mode):
+            sys.exit(f"{path} already exists and isn't a socket")
+        path.unlink()
+
+    for module in sorted((ROOT / "src").glob("day*.py")):
+        importlib.import_module(module.stem)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for line in self.rfile:
+                try:
+                    response = handle_request(json.loads(line))
+                except Exception as e:  # pylint: disable=broad-except
+                    response = {"error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                self.wfile.flush()
+
+    with socketserver.UnixStreamServer(str(path), Handler) as server:
+        print(f"Listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            path.unlink()
+
+
+def run_client(days: List[int], args: argparse.Namespace) -> None:
+    """Sends the days to a --serve worker, and prints the answers and timings
+    in the same format as -j/--jobs."""
+    import socket  # pylint: disable=import-outside-toplevel
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(args.connect))
+        with sock.makefile("rwb") as f:
+            for i, n in enumerate(days):
+                if args.input is not None and args.input.name == "<stdin>":
+                    request = {"day": n, "input": args.input.read()}
+                else:
+                    request = {"day": n, "path": str(input_path(n, args).resolve())}
+                f.write(json.dumps(request).encode() + b"\n")
+                f.flush()
+                response = json.loads(f.readline())
+                if "error" in response:
+                    sys.exit(f"Day {n}: {response['error']}")
+                print(f"Day {n}")
+                if response["parse_time"] is not None:
+                    print(f"Parse: {_format_time(response['parse_time'])}")
+                for part, answer in response["answers"].items():
+                    elapsed = response["times"][part]
+                    print(f"Part {part}: {answer}  ({_format_time(elapsed)})")
+                if i != len(days) - 1:
+                    print()
 
 
 # from IPython/core/magics/execution.py
@@ -124,7 +1270,7 @@ def get_timing(
     setup: str = "pass",
     repeat: int = 7,
     globals: Optional[Dict[str, Any]] = None,
-) -> None:
+) -> Dict[str, Any]:
     timer = timeit.Timer(stmt, setup, globals=globals)
     num_loops, total_time = timer.autorange()
     times = [
@@ -135,6 +1281,666 @@ def get_timing(
         f"{_format_time(statistics.mean(times))} ± {_format_time(statistics.stdev(times))} per loop"
         f" (mean ± std. dev. of {repeat} loops, {num_loops} loops each)\n"
     )
+    return {
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times),
+        "min": min(times),
+        "loops": num_loops,
+        "repeat": repeat,
+    }
+
+
+def run_limited(
+    n: int,
+    part: int,
+    path: Path,
+    time_limit: Optional[float],
+    mem_limit: Optional[float],
+) -> Tuple[str, Any, float]:
+    """Runs one part in a subprocess, and kills it if it takes longer than
+    `time_limit` seconds or its resident memory goes over `mem_limit` MiB.
+
+    Returns the status ("ok", "TIMEOUT", "OOM" or "ERROR"), the answer (or None),
+    and the wall time.
+    """
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    cmd = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--part-child",
+        str(n),
+        str(part),
+        str(path),
+    ]
+    start = time.perf_counter()
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
+        status = None
+        while status is None:
+            try:
+                proc.wait(timeout=0.01)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if time_limit is not None and time.perf_counter() - start > time_limit:
+                status = "TIMEOUT"
+            elif mem_limit is not None and _rss(proc.pid) > mem_limit * 2**20:
+                status = "OOM"
+        elapsed = time.perf_counter() - start
+        if status is not None:
+            proc.kill()
+            proc.wait()
+            return status, None, elapsed
+        output = proc.stdout.read()  # type: ignore
+    if proc.returncode != 0:
+        # the traceback went to stderr
+        return "ERROR", None, elapsed
+    result = json.loads(output)
+    return result["status"], result.get("answer"), elapsed
+
+
+def _rss(pid: int) -> int:
+    """Returns the resident memory of a process in bytes, or 0 if it's unknown
+    (this only works on Linux)."""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def part_child(n: int, part: int, path: Path) -> None:
+    """Runs in the subprocess started by run_limited(), and prints the answer as
+    JSON."""
+    # keep anything the solvers print out of our output
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            _, results = run_parts(n, (part,), PuzzleInput(path=path))
+        except MemoryError:
+            results = None
+    if results is None:
+        json.dump({"status": "OOM"}, sys.stdout)
+    else:
+        json.dump({"status": "ok", "answer": _to_json(results[0][1])}, sys.stdout)
+
+
+def print_trace(label: str) -> Dict[str, Any]:
+    """Prints what the solvers recorded with src/instrument.py since the last
+    reset, and returns it."""
+    import instrument  # pylint: disable=import-outside-toplevel
+
+    results = instrument.results()
+    if results["phases"] or results["counters"]:
+        print(f"{label} trace:")
+    for name, phase in results["phases"].items():
+        calls = phase["calls"]
+        print(
+            f"  {name}: {_format_time(phase['time'])}"
+            f" ({calls} call{'s' if calls != 1 else ''})"
+        )
+    for name, value in results["counters"].items():
+        print(f"  {name}: {value:,}")
+    return results
+
+
+def native_binary(n: int) -> Optional[Path]:
+    """Returns the native build of a day from bin/ (see the Makefile), if there
+    is one."""
+    path = ROOT / "bin" / f"day{n}"
+    if path.is_file() and os.access(path, os.X_OK):
+        return path
+    return None
+
+
+class NativeError(Exception):
+    """A native binary crashed or exited with an error."""
+
+
+def run_native(binary: Path, path: Path) -> Tuple[Dict[int, str], float]:
+    """Runs a native binary on an input file, and returns the answers it printed
+    (as "Part N: answer" lines) and its wall time.
+
+    Raises NativeError if it doesn't exit successfully.
+    """
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [str(binary), "-i", str(path)],
+        stdout=subprocess.PIPE,
+        check=False,
+        text=True,
+        cwd=ROOT,
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode < 0:
+        raise NativeError(f"{binary.name} was killed by signal {-proc.returncode}")
+    if proc.returncode != 0:
+        raise NativeError(f"{binary.name} exited with status {proc.returncode}")
+    answers = {}
+    for line in proc.stdout.splitlines():
+        label, sep, answer = line.partition(": ")
+        if sep and label in ("Part 1", "Part 2"):
+            answers[int(label[-1])] = answer.strip()
+    return answers, elapsed
+
+
+def get_native_timing(binary: Path, path: Path, repeat: int = 7) -> Dict[str, Any]:
+    times = [run_native(binary, path)[1] for _ in range(repeat)]
+    print(
+        f"{_format_time(statistics.mean(times))} ± {_format_time(statistics.stdev(times))} per run"
+        f" (mean ± std. dev. of {repeat} runs)\n"
+    )
+    return {
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times),
+        "min": min(times),
+        "loops": 1,
+        "repeat": repeat,
+    }
+
+
+def get_import_time(n: int) -> float:
+    """Measures the cold import time of a day module (including everything it
+    imports), which is what each new run.py process pays."""
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    code = (
+        "import sys, time; "
+        f"sys.path.insert(0, {str(ROOT / 'src')!r}); "
+        "start = time.perf_counter(); "
+        f"import day{n}; "
+        "print(time.perf_counter() - start)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, check=True, text=True
+    )
+    return float(proc.stdout)
+
+
+def get_isolated_timing(n: int, key: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Times one part of a day in a fresh interpreter, so that caches, module
+    globals and allocator state left over from computing the answer don't
+    affect the results."""
+    cmd = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--bench-child",
+        str(n),
+        key,
+        str(input_path(n, args)),
+        "--rounds",
+        str(args.rounds),
+        "--warmup",
+        str(args.warmup),
+    ]
+    if args.cpu is not None:
+        cmd.extend(["--cpu", str(args.cpu)])
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, check=True, text=True)
+    result = json.loads(proc.stdout)
+    stats = summarize_times(result["times"])
+    stats["loops"] = result["loops"]
+    stats["repeat"] = len(result["times"])
+    stats["warmup"] = args.warmup
+    print(
+        f"{_format_time(stats['median'])} median"
+        f" (IQR {_format_time(stats['q1'])} to {_format_time(stats['q3'])},"
+        f" 95% CI {_format_time(stats['ci_low'])} to {_format_time(stats['ci_high'])})"
+        f" of {stats['repeat']} rounds, {stats['loops']} loops each,"
+        f" {stats['outliers']} outliers\n"
+    )
+    return stats
+
+
+def summarize_times(times: List[float]) -> Dict[str, Any]:
+    """Computes robust statistics for a list of per-loop times.
+
+    The confidence interval for the median uses order statistics, so it doesn't
+    assume the times are normally distributed (they usually have a long tail).
+    Outliers are counted using Tukey's fences (1.5 IQR outside the quartiles).
+    """
+    times = sorted(times)
+    count = len(times)
+    q1, median, q3 = statistics.quantiles(times, n=4, method="inclusive")
+    iqr = q3 - q1
+    # ranks of the 95% confidence interval of the median (0-based)
+    half_width = 1.96 * math.sqrt(count) / 2
+    lo = max(math.floor(count / 2 - half_width), 0)
+    hi = min(math.ceil(count / 2 + half_width), count - 1)
+    outliers = sum(1 for t in times if t < q1 - 1.5 * iqr or t > q3 + 1.5 * iqr)
+    return {
+        "median": median,
+        "q1": q1,
+        "q3": q3,
+        "ci_low": times[lo],
+        "ci_high": times[hi],
+        "outliers": outliers,
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times),
+        "min": times[0],
+    }
+
+
+def bench_child(
+    n: int, key: str, path: Path, rounds: int, warmup: int, cpu: Optional[int]
+) -> None:
+    """Runs in the subprocess started by get_isolated_timing(), and prints the
+    per-loop time of each round as JSON."""
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    day = importlib.import_module(f"day{n}")
+    read = input_reader(day, PuzzleInput(path=path))
+    if key == "parse":
+        stmt = "day.parse(read())"
+    else:
+        get_data = parse_input(day, read)
+        stmt = f"day.{key}(get_data())"
+    timer = timeit.Timer(stmt, globals={**locals(), **globals()})
+    # keep anything the solvers print out of our output
+    with contextlib.redirect_stdout(sys.stderr):
+        num_loops, _ = timer.autorange()
+        timer.repeat(repeat=warmup, number=num_loops)
+        times = timer.repeat(repeat=rounds, number=num_loops)
+    json.dump({"loops": num_loops, "times": [t / num_loops for t in times]}, sys.stdout)
+
+
+def _format_size(size: float) -> str:
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(size) < 1024:
+            return f"{size:.4g} {unit}"
+        size /= 1024
+    return f"{size:.4g} GiB"
+
+
+def get_memory(func: Callable[[Any], Any], arg: Any, top: int = 5) -> Dict[str, Any]:
+    """Calls func(arg) under tracemalloc, and prints the peak memory use, the
+    memory still allocated when it returns (e.g. in caches), and the source lines
+    holding the most memory at the peak.
+
+    The peak is measured on a first call. Snapshots are far too slow to take on
+    every allocation, so func is then called again under watch_memory(), which
+    only takes them near that peak.
+    """
+    import tracemalloc  # pylint: disable=import-outside-toplevel
+
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        # don't count the memory held by the return value
+        func(arg)
+        current, peak = tracemalloc.get_traced_memory()
+        peak -= start
+        net = current - start
+
+        highest, snapshot_size, top_stats = watch_memory(
+            func, arg, peak - peak // 16, top
+        )
+        if not top_stats and highest > 0:
+            # the peak only lasted inside a single call, so settle for the
+            # highest point that can be seen (which varies a little between
+            # calls)
+            _, snapshot_size, top_stats = watch_memory(
+                func, arg, highest - highest // 16, top
+            )
+    finally:
+        tracemalloc.stop()
+
+    # the second call can use a little more memory than the first
+    snapshot_size = min(snapshot_size, peak)
+    print(f"Memory: {_format_size(peak)} peak, {_format_size(net)} net")
+    top_lines: List[Dict[str, Any]] = []
+    for stat in top_stats:
+        frame = stat.traceback[0]
+        if not top_lines:
+            print(f"  Largest allocations at {_format_size(snapshot_size)}:")
+        print(
+            f"  {frame.filename}:{frame.lineno}: {_format_size(stat.size_diff)}"
+            f" in {stat.count_diff} blocks"
+        )
+        top_lines.append(
+            {
+                "file": frame.filename,
+                "line": frame.lineno,
+                "size": stat.size_diff,
+                "count": stat.count_diff,
+            }
+        )
+    print()
+    return {
+        "peak": peak,
+        "net": net,
+        "top_at": snapshot_size if top_lines else None,
+        "top": top_lines,
+    }
+
+
+def watch_memory(
+    func: Callable[[Any], Any], arg: Any, threshold: int, top: int
+) -> Tuple[int, int, List[Any]]:
+    """Calls func(arg) with a profile hook that checks the traced memory on every
+    function call and return, and snapshots it whenever it gets above
+    `threshold`, and then 1/64 higher than the last snapshot.
+
+    Returns the highest memory use seen, the memory use at the last snapshot,
+    and the `top` source lines that allocated the most in it. All sizes are
+    relative to the start of the call. This can miss the top of a peak that only
+    lasts inside a single call.
+    """
+    import tracemalloc  # pylint: disable=import-outside-toplevel
+
+    # the allocations made by the profiling itself
+    ignored = {
+        tracemalloc.__file__,
+        __file__,
+        "<frozen importlib._bootstrap>",
+        "<frozen importlib._bootstrap_external>",
+    }
+    before = tracemalloc.take_snapshot()
+    base = 0
+    highest = 0
+    snapshot_size = 0
+    snapshot = None
+
+    def watch(*_: Any) -> None:
+        nonlocal base, threshold, highest, snapshot_size, snapshot
+        size = tracemalloc.get_traced_memory()[0] - base
+        highest = max(highest, size)
+        if size <= threshold:
+            return
+        # taking a snapshot is quick, but working out the statistics isn't, so
+        # keep just the latest one until the end
+        snapshot = None
+        snapshot = tracemalloc.take_snapshot()
+        snapshot_size = size
+        threshold = size + size // 64
+        # the snapshot is traced as well, so leave it out from now on
+        base = tracemalloc.get_traced_memory()[0] - size
+
+    old_profile = sys.getprofile()
+    # the first snapshot is traced too, so measure from after it was taken
+    base, _ = tracemalloc.get_traced_memory()
+    sys.setprofile(watch)
+    try:
+        func(arg)
+    finally:
+        sys.setprofile(old_profile)
+    if snapshot is None:
+        return highest, snapshot_size, []
+    # filtering the statistics is much quicker than filtering the snapshot
+    stats = [
+        stat
+        for stat in snapshot.compare_to(before, "lineno")
+        if stat.traceback[0].filename not in ignored
+    ]
+    # the size checked by the hook includes whatever the hook itself has
+    # allocated, so report the size of what's left instead
+    snapshot_size = sum(stat.size_diff for stat in stats)
+    top_stats = [stat for stat in stats if stat.size_diff > 0]
+    return highest, snapshot_size, top_stats[:top]
+
+
+def profile_call(func: Callable[[Any], Any], arg: Any, path: Path) -> Any:
+    """Calls func(arg) under cProfile, and writes the stats to `path`.pstats and
+    a collapsed-stack version to `path`.collapsed (for flamegraph.pl, speedscope,
+    etc.)."""
+    import cProfile  # pylint: disable=import-outside-toplevel
+    import pstats  # pylint: disable=import-outside-toplevel
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, arg)
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(path.with_suffix(".pstats"))
+    with open(path.with_suffix(".collapsed"), "w") as f:
+        for stack, microseconds in collapse_stats(stats):
+            f.write(f"{';'.join(stack)} {microseconds}\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(10)
+    return result
+
+
+def collapse_stats(stats: "pstats.Stats") -> List[Tuple[List[str], int]]:
+    """Reconstructs call stacks from cProfile's caller -> callee edges.
+
+    cProfile only records the time spent along each edge, so when a function is
+    called from several places its children are split between the callers in
+    proportion to the time each caller spent in it.
+    """
+    raw = stats.stats  # type: ignore  # pylint: disable=no-member
+    children: Dict[Any, List[Tuple[Any, float]]] = {func: [] for func in raw}
+    for func, (*_, callers) in raw.items():
+        for caller, (*_, cumtime) in callers.items():
+            children.setdefault(caller, []).append((func, cumtime))
+
+    def name(func: Any) -> str:
+        filename, lineno, funcname = func
+        if filename == "~":
+            return funcname
+        return f"{Path(filename).name}:{lineno}:{funcname}"
+
+    out: List[Tuple[List[str], int]] = []
+
+    def walk(func: Any, stack: List[str], seen: Set[Any], cumtime: float) -> None:
+        _, _, tottime, total_cumtime, _ = raw[func]
+        scale = cumtime / total_cumtime if total_cumtime else 0.0
+        stack = [*stack, name(func)]
+        if int(tottime * scale * 1e6) > 0:
+            out.append((stack, int(tottime * scale * 1e6)))
+        for child, child_cumtime in children.get(func, []):
+            if child not in seen:
+                walk(child, stack, seen | {child}, child_cumtime * scale)
+
+    for func, (_, _, _, cumtime, callers) in raw.items():
+        if not callers:
+            walk(func, [], {func}, cumtime)
+    return out
+
+
+def install_line_profiler() -> Any:
+    """Makes `profile` a builtin that line-profiles the decorated function, like
+    kernprof does. This has to happen before the day modules are imported."""
+    try:
+        import line_profiler  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    profiler = line_profiler.LineProfiler()
+    builtins.profile = profiler  # type: ignore
+    return profiler
+
+
+# version 2 hashes the raw input bytes, instead of the lines joined with newlines
+REPORT_VERSION = 2
+
+
+def new_report() -> Dict[str, Any]:
+    """Creates an empty timing report, with enough information about the
+    environment to tell whether two reports are comparable."""
+    return {
+        "version": REPORT_VERSION,
+        "python": platform.python_version(),
+        "numpy": None,
+        "machine": platform.machine(),
+        "days": {},
+    }
+
+
+def numpy_version() -> Optional[str]:
+    # only called when writing a report, so days that don't use numpy don't
+    # pay for importing it
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return str(numpy.__version__)
+
+
+HISTORY_PATH = ROOT / "history.jsonl"
+
+
+def git_commit() -> Tuple[Optional[str], bool]:
+    """Returns the current commit hash (or None, if it can't be found), and
+    whether there are uncommitted changes to tracked files."""
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+            text=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            check=True,
+            text=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(status.strip())
+
+
+def append_history(path: Path, report: Dict[str, Any]) -> None:
+    commit, dirty = git_commit()
+    entry = {
+        "commit": commit,
+        "dirty": dirty,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        **report,
+    }
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    label = "no commit" if commit is None else commit[:10] + ("*" if dirty else "")
+    print(f"\nTimings appended to {path.name} ({label})")
+
+
+def commit_subject(commit: str) -> Optional[str]:
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    proc = subprocess.run(
+        ["git", "log", "-1", "--format=%s", commit, "--"],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        return None
+    return proc.stdout.strip()
+
+
+def show_history(path: Path, threshold: float, days: Optional[List[int]]) -> None:
+    """Prints the best time of each part at each commit in the history, in the
+    order they were first recorded, and marks the commits where a part got more
+    than `threshold` slower than at the previous commit.
+
+    Only runs on this machine are used, and the comparison starts over whenever
+    the input changes.
+    """
+    try:
+        with open(path, "r") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        sys.exit("No history yet, run with -t/--timeit --history to start one")
+
+    keys = ["parse", "part_1", "part_2", "native"]
+    machine = platform.machine()
+    # (day, key) -> commit label -> (input hash, best time)
+    series: Dict[Tuple[int, str], Dict[str, Tuple[str, float]]] = {}
+    for entry in entries:
+        if entry.get("machine") != machine:
+            continue
+        commit = entry["commit"] or "unknown"
+        label = commit[:10] + ("*" if entry["dirty"] else "")
+        # hashes from different report versions never match, which starts the
+        # comparison over like a new input would
+        version = entry.get("version", 1)
+        for n, timings in entry["days"].items():
+            if days is not None and int(n) not in days:
+                continue
+            for key in keys:
+                if key not in timings:
+                    continue
+                points = series.setdefault((int(n), key), {})
+                best = timings[key]["min"]
+                input_hash = f"{version}:{timings['input_sha256']}"
+                if label in points and points[label][0] == input_hash:
+                    best = min(best, points[label][1])
+                points[label] = (input_hash, best)
+
+    slowdowns = []
+    for (n, key), points in sorted(
+        series.items(), key=lambda item: (item[0][0], keys.index(item[0][1]))
+    ):
+        print(f"Day {n} {key}:")
+        prev: Optional[Tuple[str, float]] = None
+        for label, (input_hash, best) in points.items():
+            line = f"  {label:<12}{_format_time(best):>10}"
+            if prev is not None and prev[0] != input_hash:
+                line += "  (input changed)"
+            elif prev is not None:
+                change = best / prev[1] - 1
+                line += f"  {change:+.1%}"
+                if change > threshold:
+                    line += "  SLOWDOWN"
+                    message = f"Day {n} {key}: {label} ({change:+.1%})"
+                    subject = commit_subject(label.rstrip("*"))
+                    if subject is not None:
+                        message += f" {subject}"
+                    slowdowns.append(message)
+            print(line)
+            prev = (input_hash, best)
+    if slowdowns:
+        print("\nSlowdowns (* means uncommitted changes):")
+        for slowdown in slowdowns:
+            print(f"  {slowdown}")
+
+
+def compare_timings(
+    baseline: Dict[str, Any], report: Dict[str, Any], threshold: float
+) -> bool:
+    """Prints a comparison of two timing reports, and returns False if anything
+    is more than `threshold` slower than the baseline.
+
+    The best time of each part is compared, since that is the least sensitive to
+    noise from the rest of the system.
+    """
+    ok = True
+    print("\nComparison with baseline:")
+    version = baseline.get("version", 1)
+    if version != report["version"]:
+        print(
+            f"Baseline is a version {version} report, and its input hashes can't be"
+            f" checked against version {report['version']}, skipping"
+        )
+        return ok
+    for n, timings in report["days"].items():
+        old_timings = baseline["days"].get(n)
+        if old_timings is None:
+            continue
+        if old_timings["input_sha256"] != timings["input_sha256"]:
+            print(f"Day {n}: input differs from baseline, skipping")
+            continue
+        for key in ["parse", "part_1", "part_2", "native"]:
+            if key not in timings or key not in old_timings:
+                continue
+            old = old_timings[key]["min"]
+            new = timings[key]["min"]
+            change = new / old - 1
+            status = "ok"
+            if change > threshold:
+                status = "REGRESSION"
+                ok = False
+            print(
+                f"Day {n} {key}: {_format_time(old)} -> {_format_time(new)}"
+                f" ({change:+.1%}) {status}"
+            )
+    return ok
 
 
 if __name__ == "__main__":
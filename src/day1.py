@@ -1,12 +1,76 @@
+import io
+from typing import BinaryIO, Iterable, Iterator, Union
+
 import numpy as np
+import numpy.typing as npt
+
+from grid import Buffer
+
+INPUT_TYPE = "buffer"
+
+# bytes of input to parse at a time
+BLOCK_SIZE = 1 << 20
+
+Source = Union[Buffer, BinaryIO]
+
+
+def read_blocks(source: Source, block_size: int) -> Iterator[bytes]:
+    """Yields the contents of a binary file or buffer in blocks, without copying
+    buffers."""
+    if isinstance(source, io.IOBase):
+        while block := source.read(block_size):
+            yield block
+    else:
+        view = memoryview(source)  # type: ignore
+        for start in range(0, len(view), block_size):
+            yield view[start : start + block_size]  # type: ignore
+
+
+def iter_readings(
+    source: Source, block_size: int = BLOCK_SIZE
+) -> Iterator[npt.NDArray[np.int64]]:
+    """Yields the depth readings from a file or buffer, a block at a time.
+
+    A number that's split between two blocks is carried over to the next one,
+    so only one block is in memory at once.
+    """
+    leftover = b""
+    for block in read_blocks(source, block_size):
+        data = leftover + bytes(block)
+        # hold back the last line if the block ends in the middle of it
+        end = data.rfind(b"\n") + 1
+        leftover = data[end:]
+        yield parse_ints(data[:end])
+    yield parse_ints(leftover)
+
+
+def parse_ints(data: bytes) -> npt.NDArray[np.int64]:
+    # numpy parses the text in C, without making an object for each number
+    if not data.strip():
+        return np.empty(0, dtype=np.int64)
+    return np.fromstring(data, dtype=np.int64, sep=" ")
+
+
+def count_increases(chunks: Iterable[npt.NDArray[np.int64]], window: int) -> int:
+    """Counts how many times the sum of `window` consecutive readings is larger
+    than the sum before it.
+
+    Neighbouring windows share all but one reading, so the sum increases exactly
+    when data[i + window] > data[i]. Only the last `window` readings have to be
+    carried over between chunks.
+    """
+    count = 0
+    carry = np.empty(0, dtype=np.int64)
+    for chunk in chunks:
+        data = np.concatenate((carry, chunk))
+        count += int(np.count_nonzero(data[window:] > data[:-window]))
+        carry = data[-window:]
+    return count
 
 
-def part_1(lines):
-    data = np.array(lines, dtype=int)
-    return np.sum(np.diff(data) > 0)  # type: ignore
+def part_1(buffer: Source) -> int:
+    return count_increases(iter_readings(buffer), 1)
 
 
-def part_2(lines):
-    data = np.array(lines, dtype=int)
-    windowed = data[:-2] + data[1:-1] + data[2:]
-    return np.sum(np.diff(windowed) > 0)  # type: ignore
+def part_2(buffer: Source) -> int:
+    return count_increases(iter_readings(buffer), 3)
@@ -1,4 +1,6 @@
-from typing import Deque, List, Tuple
+from typing import Deque, Iterable, Tuple
+
+INPUT_TYPE = "iter"
 
 MARKERS = {
     "(": ")",
@@ -39,7 +41,7 @@ def check_line(line: str) -> Tuple[bool, str]:
     return True, "".join(marker_stack)
 
 
-def part_1(lines: List[str]) -> int:
+def part_1(lines: Iterable[str]) -> int:
     score = 0
     for line in lines:
         valid, bad_char = check_line(line)
@@ -48,7 +50,7 @@ def part_1(lines: List[str]) -> int:
     return score
 
 
-def part_2(lines: List[str]) -> int:
+def part_2(lines: Iterable[str]) -> int:
     scores = []
     for line in lines:
         score = 0
@@ -1,12 +1,16 @@
 import itertools
-from typing import List
 
 import numpy as np
 import numpy.typing as npt
 
+from grid import Buffer, parse_digits
 
-def parse(lines: List[str]) -> npt.NDArray[int]:
-    return np.array([list(l) for l in lines], dtype=int)
+INPUT_TYPE = "buffer"
+
+
+def parse(buffer: Buffer) -> npt.NDArray[np.uint8]:
+    # energy levels never go above 18 (9 plus one flash from each neighbor)
+    return parse_digits(buffer)
 
 
 def display(energy: npt.NDArray[int]) -> None:
@@ -32,8 +36,9 @@ def calc_step(energy: npt.NDArray[int]) -> npt.NDArray[bool]:
     return flashed
 
 
-def part_1(lines: List[str]) -> int:
-    energy = parse(lines)
+def part_1(energy: npt.NDArray[int]) -> int:
+    # calc_step works in-place
+    energy = energy.copy()
     flash_count = 0
 
     # display(energy)
@@ -45,8 +50,8 @@ def part_1(lines: List[str]) -> int:
     return flash_count
 
 
-def part_2(lines: List[str]) -> int:
-    energy = parse(lines)
+def part_2(energy: npt.NDArray[int]) -> int:
+    energy = energy.copy()
     step = 0
 
     while True:
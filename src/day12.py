@@ -1,6 +1,8 @@
 from collections import defaultdict
 from typing import Counter, Dict, Iterator, List
 
+from variants import variant
+
 Node = int
 START = 0
 END = 1
@@ -116,13 +118,19 @@ def dfs_iter(G: Graph, can_visit_twice: bool) -> int:
     return count
 
 
-def part_1(lines: List[str]) -> int:
-    G = parse(lines)
-    # return dfs_step(G, [START])
+def part_1(G: Graph) -> int:
     return dfs_iter(G, False)
 
 
-def part_2(lines: List[str]) -> int:
-    G = parse(lines)
-    # return dfs_step(G, [START], True)
+def part_2(G: Graph) -> int:
     return dfs_iter(G, True)
+
+
+@variant(1, "dfs_step")
+def part_1_step(G: Graph) -> int:
+    return dfs_step(G, [START])
+
+
+@variant(2, "dfs_step")
+def part_2_step(G: Graph) -> int:
+    return dfs_step(G, [START], True)
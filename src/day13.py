@@ -25,7 +25,10 @@ class Fold(NamedTuple):
         assert False
 
 
-def parse(lines: List[str]) -> Tuple[Set[Dot], List[Fold]]:
+Manual = Tuple[Set[Dot], List[Fold]]
+
+
+def parse(lines: List[str]) -> Manual:
     dots = set()
     folds = []
     for line in lines:
@@ -59,8 +62,8 @@ def pretty(dots: Set[Dot], fold: Optional[Fold] = None, bg_char: str = ".") -> s
     return "\n".join("".join(line) for line in lines)
 
 
-def part_1(lines: List[str]) -> int:
-    dots, folds = parse(lines)
+def part_1(manual: Manual) -> int:
+    dots, folds = manual
     # print(",\n".join(map(str, sorted(dots))))
     # print("\n" + pretty(dots, folds[0]) + "\n")
     dots = apply_fold(dots, folds[0])
@@ -69,8 +72,8 @@ def part_1(lines: List[str]) -> int:
     return len(dots)
 
 
-def part_2(lines: List[str]) -> str:
-    dots, folds = parse(lines)
+def part_2(manual: Manual) -> str:
+    dots, folds = manual
     for fold in folds:
         dots = apply_fold(dots, fold)
     return "\n" + pretty(dots, bg_char=" ")
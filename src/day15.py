@@ -4,11 +4,16 @@ from typing import Dict, Generator, List, Tuple
 import numpy as np
 import numpy.typing as npt
 
+import instrument
+from grid import Buffer, parse_digits
+
+INPUT_TYPE = "buffer"
+
 Coord = Tuple[int, int]
 
 
-def parse(lines: List[str]) -> npt.NDArray[int]:
-    return np.array([list(l) for l in lines], dtype=int)
+def parse(buffer: Buffer) -> npt.NDArray[np.uint8]:
+    return parse_digits(buffer)
 
 
 class PriorityQueue:
@@ -16,6 +21,7 @@ class PriorityQueue:
         self.pq: List[Tuple[int, Coord]] = []
 
     def add(self, coord: Coord, distance: int = 0) -> None:
+        instrument.count("heap pushes")
         heapq.heappush(self.pq, (distance, coord))
 
     def pop_min(self) -> Tuple[int, Coord]:
@@ -25,6 +31,7 @@ class PriorityQueue:
         return bool(self.pq)
 
 
+@instrument.timed("dijkstra")
 def dijkstra(cave: npt.NDArray[int]) -> int:
     start = (0, 0)
     dest = (cave.shape[0] - 1, cave.shape[1] - 1)
@@ -49,9 +56,11 @@ def dijkstra(cave: npt.NDArray[int]) -> int:
     while queue:
         dist, current = queue.pop_min()
         if dist != distances[current]:
+            instrument.count("stale pops")
             continue
         for n in neighbors(current):
-            tentative_distance = distances[current] + cave[n]
+            # convert to a Python int, so the distance doesn't overflow uint8
+            tentative_distance = distances[current] + int(cave[n])
             if n not in distances or tentative_distance < distances[n]:
                 distances[n] = tentative_distance
                 queue.add(n, tentative_distance)
@@ -61,15 +70,14 @@ def dijkstra(cave: npt.NDArray[int]) -> int:
     return distances[dest]
 
 
-def part_1(lines: List[str]) -> int:
-    cave = parse(lines)
+def part_1(cave: npt.NDArray[int]) -> int:
     return dijkstra(cave)
 
 
-def part_2(lines: List[str]) -> int:
-    cave = parse(lines)
-    shifts = np.arange(5)[:, np.newaxis] + np.arange(5)
-    # np.kron makes a block matrix out of the inputs
-    cave = np.tile(cave, shifts.shape) + np.kron(shifts, np.ones_like(cave))  # type: ignore
-    cave = (cave - 1) % 9 + 1  # type: ignore
+def part_2(cave: npt.NDArray[int]) -> int:
+    with instrument.phase("tile cave"):
+        shifts = np.arange(5)[:, np.newaxis] + np.arange(5)
+        # np.kron makes a block matrix out of the inputs
+        cave = np.tile(cave, shifts.shape) + np.kron(shifts, np.ones_like(cave))  # type: ignore
+        cave = (cave - 1) % 9 + 1  # type: ignore
     return dijkstra(cave)
@@ -111,13 +111,16 @@ def solve(init: Coords, t: IntArray) -> Coords:
     return Coords(vx, vy, x, y)
 
 
-def parse(lines: List[str]) -> Tuple[range, range]:
+Target = Tuple[range, range]
+
+
+def parse(lines: List[str]) -> Target:
     m = re.match(r"target area: x=(-?\d+)\.\.(-?\d+), y=(-?\d+)\.\.(-?\d+)", lines[0])
     assert m is not None
     return range(int(m[1]), int(m[2]) + 1), range(int(m[3]), int(m[4]) + 1)
 
 
-def draw(coords: Coords, target: Optional[Tuple[range, range]] = None) -> None:
+def draw(coords: Coords, target: Optional[Target] = None) -> None:
     start: Coords = coords[0]  # type: ignore
     x_min = coords.x.min()
     x_max = coords.x.max()
@@ -157,9 +160,9 @@ def draw(coords: Coords, target: Optional[Tuple[range, range]] = None) -> None:
     )
 
 
-def part_1(lines: List[str]) -> int:
+def part_1(target: Target) -> int:
     # ignore x for now, as we can probably land that target pretty easily
-    _, y_range = parse(lines)
+    _, y_range = target
 
     # We always hit y=0 exactly, so the highest y velocity will have to put us
     # at the bottom edge of the target.
@@ -175,8 +178,8 @@ def part_1(lines: List[str]) -> int:
     # return int(path.y)
 
 
-def part_2(lines: List[str]) -> int:
-    x_range, y_range = parse(lines)
+def part_2(target: Target) -> int:
+    x_range, y_range = target
 
     x_max = x_range.stop - 1
     y_min = y_range.start
@@ -6,6 +6,8 @@ import operator
 from dataclasses import dataclass
 from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
 
+import instrument
+
 
 @dataclass
 class Pair:
@@ -81,6 +83,7 @@ class Number:
                     next(it)
                     # next number, if it exists
                     next_path, _ = next(it, (None, -1))
+                    instrument.count("explosions")
                     self.explode(path[:4], prev_path, next_path)
                     modified = True
                     break
@@ -90,6 +93,7 @@ class Number:
             # find numbers >= 10
             for path, val in self.pair.paths():
                 if val >= 10:
+                    instrument.count("splits")
                     self.split(path, val)
                     modified = True
                     break
@@ -133,12 +137,12 @@ def parse(lines: List[str]) -> List[Number]:
     return nums
 
 
-def part_1(lines: List[str]) -> int:
-    nums = parse(lines)
-    total = functools.reduce(operator.add, nums)
-    return total.magnitude()
+def part_1(nums: List[Number]) -> int:
+    with instrument.phase("add"):
+        total = functools.reduce(operator.add, nums)
+    with instrument.phase("magnitude"):
+        return total.magnitude()
 
 
-def part_2(lines: List[str]) -> int:
-    nums = parse(lines)
+def part_2(nums: List[Number]) -> int:
     return max((n1 + n2).magnitude() for n1, n2 in itertools.permutations(nums, 2))
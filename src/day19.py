@@ -1,3 +1,4 @@
+import copy
 import itertools
 from collections import defaultdict
 from dataclasses import dataclass, field
@@ -208,8 +209,9 @@ def parse(lines: List[str]) -> List[Scanner]:
     return scanners
 
 
-def part_1(lines: List[str]) -> int:
-    scanners = parse(lines)
+def part_1(scanners: List[Scanner]) -> int:
+    # identify() fills in the scanner positions
+    scanners = copy.deepcopy(scanners)
 
     identify(scanners)
     print()
@@ -1,33 +1,129 @@
-from typing import List
-
-
-def part_1(commands: List[str]) -> int:
-    pos = 0
-    depth = 0
-    for cmd in commands:
-        direction, count_ = cmd.split()
-        count = int(count_)
-        if direction == "down":
-            depth += count
-        if direction == "up":
-            depth -= count
-        if direction == "forward":
-            pos += count
-    return pos * depth
-
-
-def part_2(commands: List[str]) -> int:
-    pos = 0
-    depth = 0
-    aim = 0
-    for cmd in commands:
-        direction, count_ = cmd.split()
-        count = int(count_)
-        if direction == "down":
-            aim += count
-        if direction == "up":
-            aim -= count
-        if direction == "forward":
-            pos += count
-            depth += aim * count
-    return pos * depth
+from typing import TYPE_CHECKING, List, NamedTuple, Tuple, Union
+
+# numpy is imported inside the functions that use it, since importing it takes
+# much longer than solving the real input with plain loops
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from grid import Buffer
+
+    IntArray = npt.NDArray[np.int64]
+
+INPUT_TYPE = "buffer"
+
+# inputs smaller than this many bytes are solved with plain loops (the real
+# input is about 8 KiB), and anything larger with numpy
+NUMPY_MIN_SIZE = 1 << 16
+
+# commands are identified by their first letter
+FORWARD = ord("f")
+DOWN = ord("d")
+UP = ord("u")
+
+CommandArrays = Tuple["npt.NDArray[np.uint8]", "IntArray"]
+# either a list of (first letter, magnitude), or the same as two arrays
+Commands = Union[List[Tuple[int, int]], CommandArrays]
+
+
+class Trajectory(NamedTuple):
+    """The state of the submarine after each command, using the part 2 rules.
+
+    The depth with the part 1 rules is the same as `aim`.
+    """
+
+    pos: "IntArray"
+    depth: "IntArray"
+    aim: "IntArray"
+
+
+def parse(buffer: "Buffer") -> Commands:
+    if len(buffer) >= NUMPY_MIN_SIZE:
+        return parse_arrays(buffer)
+    return [
+        (line[0], int(line.split()[1])) for line in bytes(buffer).splitlines() if line
+    ]
+
+
+def parse_arrays(buffer: "Buffer") -> CommandArrays:
+    """Returns the first letter of each command, and its magnitude."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    newline = raw == ord("\n")
+    # a line starts at the beginning, or after a newline, unless it's empty
+    starts = np.flatnonzero(~newline & np.concatenate(([True], newline[:-1])))
+    directions = raw[starts]
+    if not directions.size:
+        return directions, np.empty(0, dtype=np.int64)
+    # each line has one number, so blank out everything else and let numpy
+    # parse the rest
+    is_digit = (raw >= ord("0")) & (raw <= ord("9"))
+    digits = np.where(is_digit, raw, np.uint8(ord(" "))).tobytes()
+    magnitudes = np.fromstring(digits, dtype=np.int64, sep=" ")
+    if magnitudes.size != directions.size:
+        raise ValueError("each command needs exactly one magnitude")
+    return directions, magnitudes
+
+
+def deltas(commands: Commands) -> Tuple["IntArray", "IntArray"]:
+    """Returns the forward movement and change in aim of each command."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if isinstance(commands, list):
+        directions = np.array([d for d, _ in commands], dtype=np.uint8)
+        magnitudes = np.array([m for _, m in commands], dtype=np.int64)
+    else:
+        directions, magnitudes = commands
+    forward = np.where(directions == FORWARD, magnitudes, 0)
+    aim = np.where(
+        directions == DOWN, magnitudes, np.where(directions == UP, -magnitudes, 0)
+    )
+    return forward, aim
+
+
+def trajectory(commands: Commands) -> Trajectory:
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    forward, aim_change = deltas(commands)
+    aim = np.cumsum(aim_change)
+    # the depth changes by aim * forward on each step
+    return Trajectory(np.cumsum(forward), np.cumsum(aim * forward), aim)
+
+
+def part_1(commands: Commands) -> int:
+    if isinstance(commands, list):
+        pos = 0
+        depth = 0
+        for direction, count in commands:
+            if direction == DOWN:
+                depth += count
+            if direction == UP:
+                depth -= count
+            if direction == FORWARD:
+                pos += count
+        return pos * depth
+    forward, aim_change = deltas(commands)
+    # convert to Python ints, so the product can't overflow
+    return int(forward.sum()) * int(aim_change.sum())
+
+
+def part_2(commands: Commands) -> int:
+    if isinstance(commands, list):
+        pos = 0
+        depth = 0
+        aim = 0
+        for direction, count in commands:
+            if direction == DOWN:
+                aim += count
+            if direction == UP:
+                aim -= count
+            if direction == FORWARD:
+                pos += count
+                depth += aim * count
+        return pos * depth
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    forward, aim_change = deltas(commands)
+    depth = np.dot(np.cumsum(aim_change), forward)
+    return int(forward.sum()) * int(depth)
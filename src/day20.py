@@ -1,16 +1,24 @@
-from typing import List, Tuple
+from typing import Tuple
 
 import numpy as np
 import numpy.typing as npt
 
+from grid import Buffer, parse_bits
+from variants import variant
+
+INPUT_TYPE = "buffer"
+
 BitArray = npt.NDArray[np.bool_]
 
 
-def parse(lines: List[str]) -> Tuple[BitArray, BitArray]:
-    lut: BitArray = np.array([x == "#" for x in lines[0]], dtype=np.bool_)
-    image: BitArray = np.array(
-        [[x == "#" for x in line] for line in lines[2:]], dtype=np.bool_
-    )
+Puzzle = Tuple[BitArray, BitArray]
+
+
+def parse(buffer: Buffer) -> Puzzle:
+    # the enhancement algorithm is a single line, then a blank line, then the image
+    split = buffer.find(b"\n\n")
+    lut = parse_bits(buffer, 0, split + 1)[0]
+    image = parse_bits(buffer, split + 2)
     return lut, image
 
 
@@ -39,6 +47,21 @@ def enhance_vec(lut: BitArray, orig_image: BitArray, iters: int) -> BitArray:
     return orig_image
 
 
+def enhance_sep(lut: BitArray, orig_image: BitArray, iters: int) -> BitArray:
+    """Same as enhance_vec(), but builds the 3-bit code of each row of the window
+    first, and then combines three rows, which takes fewer array operations."""
+    for i in range(iters):
+        bg = lut[0] and i % 2 == 1
+        image = np.full(
+            (orig_image.shape[0] + 4, orig_image.shape[1] + 4), bg, dtype=np.uint16
+        )
+        image[2:-2, 2:-2] = orig_image
+        rows = (image[:, :-2] << 2) | (image[:, 1:-1] << 1) | image[:, 2:]
+        indices = (rows[:-2] << 6) | (rows[1:-1] << 3) | rows[2:]
+        orig_image = lut[indices]
+    return orig_image
+
+
 def display(image: BitArray) -> None:
     print(
         "\n".join(
@@ -55,13 +78,25 @@ def display(image: BitArray) -> None:
     )
 
 
-def part_1(lines: List[str]) -> int:
-    lut, image = parse(lines)
+def part_1(puzzle: Puzzle) -> int:
+    lut, image = puzzle
     image = enhance_vec(lut, image, 2)
     return np.count_nonzero(image)
 
 
-def part_2(lines: List[str]) -> int:
-    lut, image = parse(lines)
+def part_2(puzzle: Puzzle) -> int:
+    lut, image = puzzle
     image = enhance_vec(lut, image, 50)
     return np.count_nonzero(image)
+
+
+@variant(1, "enhance_sep")
+def part_1_sep(puzzle: Puzzle) -> int:
+    lut, image = puzzle
+    return np.count_nonzero(enhance_sep(lut, image, 2))
+
+
+@variant(2, "enhance_sep")
+def part_2_sep(puzzle: Puzzle) -> int:
+    lut, image = puzzle
+    return np.count_nonzero(enhance_sep(lut, image, 50))
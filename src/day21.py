@@ -29,8 +29,7 @@ def play_deterministic(start_1: int, start_2: int) -> Tuple[int, int, int]:
     return rolls, scores[curr_player], scores[1 - curr_player]
 
 
-def part_1(lines: List[str]) -> int:
-    starts = parse(lines)
+def part_1(starts: Tuple[int, int]) -> int:
     rolls, _, loser = play_deterministic(*starts)
     return rolls * loser
 
@@ -74,7 +73,6 @@ def play_dirac(start_1: int, start_2: int) -> List[int]:
     return step_dirac(start_1 - 1, start_2 - 1)
 
 
-def part_2(lines: List[str]) -> int:
-    starts = parse(lines)
+def part_2(starts: Tuple[int, int]) -> int:
     wins = play_dirac(*starts)
     return max(wins)
@@ -6,6 +6,8 @@ import re
 from functools import cached_property
 from typing import Any, Iterator, List, NamedTuple, Tuple, TypeVar, Union, cast
 
+import instrument
+
 PROFILING = "profile" in dir(builtins)
 if not PROFILING:
     # for line profiler
@@ -108,6 +110,7 @@ class ITree:
         # merge identical sections
         for i in range(len(self.splits))[::-1]:
             if self.values[i + 1] == self.values[i]:
+                instrument.count("merges")
                 del self.splits[i]
                 del self.values[i]
 
@@ -115,6 +118,7 @@ class ITree:
     def _split(self, pos: int) -> int:
         index = bisect.bisect(self.splits, pos)
         if index >= len(self.splits) or self.splits[index] != pos:
+            instrument.count("splits")
             self.splits.insert(index, pos)
             # insert a copy of the indexed value right after it
             value = copy.deepcopy(self.values[index])
@@ -122,7 +126,10 @@ class ITree:
         return index
 
 
-def parse(lines: List[str]) -> List[Tuple[bool, Cuboid]]:
+Steps = List[Tuple[bool, Cuboid]]
+
+
+def parse(lines: List[str]) -> Steps:
     steps = []
     for line in lines:
         action, rest = line.split(" ")
@@ -135,25 +142,28 @@ def parse(lines: List[str]) -> List[Tuple[bool, Cuboid]]:
     return steps
 
 
-def part_1(lines: List[str]) -> int:
-    steps = parse(lines)
+def part_1(steps: Steps) -> int:
     init_range = Range(-50, 50)
 
     itree = ITree()
-    for state, cuboid in steps:
-        if all(
-            cuboid[i].lo in init_range and cuboid[i].hi in init_range for i in range(3)
-        ):
-            itree.update(state, cuboid)
+    with instrument.phase("update"):
+        for state, cuboid in steps:
+            if all(
+                cuboid[i].lo in init_range and cuboid[i].hi in init_range
+                for i in range(3)
+            ):
+                itree.update(state, cuboid)
 
-    return itree.count_on()
+    with instrument.phase("count"):
+        return itree.count_on()
 
 
-def part_2(lines: List[str]) -> int:
-    steps = parse(lines)
+def part_2(steps: Steps) -> int:
 
     itree = ITree()
-    for state, cuboid in steps:
-        itree.update(state, cuboid)
+    with instrument.phase("update"):
+        for state, cuboid in steps:
+            itree.update(state, cuboid)
 
-    return itree.count_on()
+    with instrument.phase("count"):
+        return itree.count_on()
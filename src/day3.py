@@ -1,48 +1,152 @@
-from typing import List, Sequence
+from typing import Iterator, Tuple
 
 import numpy as np
 import numpy.typing as npt
 
+from grid import Buffer, grid_view
+from variants import variant
 
-def bits_to_int(bits: Sequence[int]) -> int:
-    return sum(1 << i for i, bit in enumerate(bits[::-1]) if bit)
+INPUT_TYPE = "buffer"
 
+# number of report lines to process at a time
+BLOCK_ROWS = 1 << 16
 
-def part_1(lines: List[str]) -> int:
-    bits = np.array([list(l) for l in lines], dtype=int)
-    most_frequent = (np.mean(bits, axis=0) >= 0.5).astype(int)
-    least_frequent = 1 - most_frequent
+Packed = npt.NDArray[np.uint64]
+
+
+def iter_blocks(buffer: Buffer) -> Iterator[npt.NDArray[np.uint8]]:
+    """Yields the report a block of whole lines at a time, as 2D views of the
+    buffer (so nothing is copied)."""
+    width = buffer.find(b"\n")
+    if width == -1:
+        width = len(buffer)
+    block_size = BLOCK_ROWS * (width + 1)
+    for start in range(0, len(buffer), block_size):
+        yield grid_view(buffer, start, min(start + block_size, len(buffer)))
+
+
+def column_counts(buffer: Buffer) -> Tuple[npt.NDArray[np.int64], int]:
+    """Returns the number of ones in each column, and the number of lines.
+
+    Only one block is looked at at a time, so this takes O(width) memory on top
+    of the block.
+    """
+    counts = np.zeros(0, dtype=np.int64)
+    total = 0
+    for block in iter_blocks(buffer):
+        # summing the ASCII digits is faster than comparing them (and a uint32
+        # can't overflow for any reasonable block size)
+        block_counts = block.sum(axis=0, dtype=np.uint32).astype(np.int64)
+        block_counts -= ord("0") * block.shape[0]
+        counts = block_counts if not total else counts + block_counts
+        total += block.shape[0]
+    return counts, total
+
+
+def pack_rows(buffer: Buffer) -> Tuple[Packed, int]:
+    """Packs each line of the report into an unsigned integer (so it can be at
+    most 64 bits wide), and returns them along with the width."""
+    blocks = []
+    width = 0
+    for block in iter_blocks(buffer):
+        width = block.shape[1]
+        if width > 64:
+            raise ValueError("report lines can be at most 64 bits wide")
+        packed = np.packbits(block == ord("1"), axis=1)
+        # right-align the bytes in 8-byte words, and read them as big-endian
+        words = np.zeros((block.shape[0], 8), dtype=np.uint8)
+        words[:, 8 - packed.shape[1] :] = packed
+        values = words.view(">u8").ravel().astype(np.uint64)
+        # packbits pads the last byte with zeros at the end
+        blocks.append(values >> np.uint64(8 * packed.shape[1] - width))
+    if not blocks:
+        return np.zeros(0, dtype=np.uint64), 0
+    return np.concatenate(blocks), width
+
+
+def bits_to_int(bits: npt.NDArray[np.bool_]) -> int:
+    """Converts a big-endian array of bits to an int."""
+    return int.from_bytes(np.packbits(bits).tobytes(), "big") >> (-bits.size % 8)
+
+
+def part_1(buffer: Buffer) -> int:
+    counts, total = column_counts(buffer)
+    most_frequent = 2 * counts >= total
     gamma = bits_to_int(most_frequent)
-    epsilon = bits_to_int(least_frequent)
+    epsilon = bits_to_int(~most_frequent)
     return gamma * epsilon
 
 
-def filter_at_bit(
-    bits: npt.NDArray[int], position: int, most_common: bool
-) -> npt.NDArray[int]:
-    mean = np.mean(bits[:, position], axis=0)
-    if mean == 0.5:
-        target = int(most_common)
-    elif most_common:
-        target = int(mean > 0.5)
-    else:
-        target = int(mean < 0.5)
+class ReportIndex:
+    """The packed report lines, sorted once so that any rating can be found by
+    binary search.
+
+    Within a range of sorted values that share their first few bits, the ones
+    with a 0 in the next bit all come before the ones with a 1, so each step of
+    the filter just splits the range in two.
+    """
 
-    mask = bits[:, position] == target
-    return bits[mask]  # type: ignore
+    def __init__(self, values: Packed, width: int):
+        self.values = np.sort(values)
+        self.width = width
 
+    def split(self, lo: int, hi: int, prefix: int, position: int) -> int:
+        """Returns where the values in [lo, hi) (which all start with `prefix`)
+        switch from a 0 to a 1 at bit `position`."""
+        key = np.uint64(prefix | (1 << position))
+        return lo + int(np.searchsorted(self.values[lo:hi], key))
 
-def calc_rating(bits: npt.NDArray[int], most_common: bool) -> int:
-    position = 0
-    while bits.shape[0] > 1:
-        bits = filter_at_bit(bits, position, most_common)
-        position += 1
-    return bits_to_int(bits[0])
+    def rating(self, most_common: bool) -> int:
+        lo, hi = 0, self.values.size
+        prefix = 0
+        position = self.width - 1
+        # the values left once every bit has been used are all the same
+        while hi - lo > 1 and position >= 0:
+            mid = self.split(lo, hi, prefix, position)
+            zeros, ones = mid - lo, hi - mid
+            # ties go to 1 for the most common value, and 0 for the least common
+            if most_common:
+                keep_ones = ones >= zeros
+            else:
+                keep_ones = ones < zeros
+            # if every value has the same bit here, there's nothing to filter
+            if zeros == 0 or ones == 0:
+                keep_ones = ones > 0
+            if keep_ones:
+                lo = mid
+                prefix |= 1 << position
+            else:
+                hi = mid
+            position -= 1
+        return int(self.values[lo])
 
 
-def part_2(lines: List[str]) -> int:
-    bits = np.array([list(l) for l in lines], dtype=int)
-    oxygen = calc_rating(bits, True)
-    co2 = calc_rating(bits, False)
+def part_2(buffer: Buffer) -> int:
+    index = ReportIndex(*pack_rows(buffer))
+    oxygen = index.rating(True)
+    co2 = index.rating(False)
 
     return oxygen * co2
+
+
+def filter_rating(values: Packed, width: int, most_common: bool) -> int:
+    """Finds a rating by filtering a copy of the values at each bit."""
+    position = width - 1
+    while values.size > 1 and position >= 0:
+        bits = (values >> np.uint64(position)) & np.uint64(1)
+        ones = np.count_nonzero(bits)
+        if ones in (0, values.size):
+            target = int(ones > 0)
+        elif most_common:
+            target = int(2 * ones >= values.size)
+        else:
+            target = int(2 * ones < values.size)
+        values = values[bits == target]
+        position -= 1
+    return int(values[0])
+
+
+@variant(2, "filter")
+def part_2_filter(buffer: Buffer) -> int:
+    values, width = pack_rows(buffer)
+    return filter_rating(values, width, True) * filter_rating(values, width, False)
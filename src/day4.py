@@ -1,16 +1,99 @@
-from typing import List
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
 
 import numpy as np
 import numpy.typing as npt
 
+from grid import Buffer
+from variants import variant
+
+INPUT_TYPE = "buffer"
+
+IntArray = npt.NDArray[np.int64]
+
+Game = Tuple[IntArray, IntArray]
+
+
+def parse(buffer: Buffer) -> Game:
+    end = buffer.find(b"\n")
+    order = np.fromstring(bytes(buffer[:end]), dtype=np.int64, sep=",")
+    # the boards are just whitespace-separated numbers, 25 at a time
+    boards = np.fromstring(bytes(buffer[end + 1 :]), dtype=np.int64, sep=" ")
+    return order, boards.reshape(-1, 5, 5)
+
+
+class Tournament:
+    """Works out when every board wins, without playing the game.
+
+    Each cell is marked on the turn its number is drawn, so a line is complete
+    on the latest turn of any of its cells, and a board wins on the earliest
+    turn that any of its lines is complete.
+    """
+
+    def __init__(self, order: IntArray, boards: IntArray):
+        never = len(order)
+        # turn on which each cell is marked (len(order) if it never is)
+        numbers, first_turns = np.unique(order, return_index=True)
+        turn_type = np.min_scalar_type(never)
+        lo = min(order.min(initial=0), boards.min(initial=0))
+        hi = max(order.max(initial=0), boards.max(initial=0))
+        if hi - lo < 4 * (order.size + boards.size):
+            # a lookup table is fastest, as long as the numbers are about as
+            # dense as the input
+            turn_of = np.full(hi - lo + 1, never, dtype=turn_type)
+            turn_of[numbers - lo] = first_turns
+            cell_turns = turn_of[boards - lo]
+        else:
+            # otherwise, look each number up in the sorted draws, so the memory
+            # used doesn't depend on how big the numbers are
+            first_turns = np.append(first_turns, never).astype(turn_type)
+            index = np.searchsorted(numbers, boards)
+            drawn = (index < numbers.size) & (np.append(numbers, 0)[index] == boards)
+            cell_turns = first_turns[np.where(drawn, index, numbers.size)]
+        #: turn on which each board wins, or len(order) if it never does
+        self.win_turns: IntArray = np.minimum(
+            cell_turns.max(axis=2).min(axis=1), cell_turns.max(axis=1).min(axis=1)
+        ).astype(np.int64)
+        unmarked = np.where(
+            cell_turns > self.win_turns[:, np.newaxis, np.newaxis], boards, 0
+        ).sum(axis=(1, 2))
+        # boards that never win score 0
+        last_draw = np.append(order, 0)
+        self.scores: IntArray = unmarked * last_draw[self.win_turns]
+        #: boards that win, in the order they do (ties go to the lower index)
+        self.ranking: IntArray = np.argsort(self.win_turns, kind="stable")
+        self.ranking = self.ranking[: np.count_nonzero(self.win_turns < never)]
+
+    def winner(self, rank: int) -> Tuple[int, int]:
+        """Returns the index and score of the board that wins in place `rank`
+        (counting from 0, and negative ranks count back from the last winner)."""
+        board = int(self.ranking[rank])
+        return board, int(self.scores[board])
+
+
+def part_1(game: Game) -> int:
+    tournament = Tournament(*game)
+    if not tournament.ranking.size:
+        return -1
+    return tournament.winner(0)[1]
+
+
+def part_2(game: Game) -> int:
+    tournament = Tournament(*game)
+    # every board has to win
+    if tournament.ranking.size < game[1].shape[0] or not tournament.ranking.size:
+        return -1
+    # if several boards win on the last turn, take the first one, like
+    # part_2_simulate()
+    ranked_turns = tournament.win_turns[tournament.ranking]
+    return tournament.winner(int(np.searchsorted(ranked_turns, ranked_turns[-1])))[1]
+
 
 class Bingo:
-    def __init__(self, lines: List[str]):
-        self.order = [int(n) for n in lines[0].split(",")]
-        boards = []
-        for i in range(2, len(lines) - 1, 6):
-            boards.append([l.split() for l in lines[i : i + 5]])
-        self.boards: npt.NDArray[int] = np.array(boards, dtype=int)
+    def __init__(self, order: IntArray, boards: IntArray):
+        self.order = order
+        # mark() never modifies boards in-place, so this doesn't need a copy
+        self.boards = boards
         self.marked: npt.NDArray[bool] = np.zeros_like(self.boards, dtype=bool)
 
     def mark(self, number: int) -> List[int]:
@@ -28,8 +111,75 @@ class Bingo:
         return []
 
 
-def part_1(lines: List[str]) -> int:
-    bingo = Bingo(lines)
+class LiveBingo:
+    """Plays bingo one draw at a time, for when the draws arrive live.
+
+    An inverted index maps each number to the cells that contain it, so a draw
+    only touches those cells, and each board keeps a count of the marked cells
+    in each row and column. Boards can be added and retired between draws.
+    """
+
+    SIZE = 5
+
+    def __init__(self) -> None:
+        # number -> board id -> position (row * SIZE + col) of each cell with
+        # that number
+        self.cells: Dict[int, Dict[int, List[int]]] = defaultdict(dict)
+        # the numbers on each board, in row-major order
+        self.boards: Dict[int, List[int]] = {}
+        # for each board, the marked cells in each row, then in each column,
+        # then the sum of the unmarked numbers
+        self.counts: Dict[int, List[int]] = {}
+        self.next_id = 0
+
+    def add_board(self, board: Sequence[Sequence[int]]) -> int:
+        """Adds a board, and returns its id. Only numbers drawn after this count
+        towards it."""
+        board_id = self.next_id
+        self.next_id += 1
+        numbers = [int(x) for row in board for x in row]
+        if len(numbers) != self.SIZE**2:
+            raise ValueError(f"boards must be {self.SIZE}x{self.SIZE}")
+        self.boards[board_id] = numbers
+        for pos, number in enumerate(numbers):
+            self.cells[number].setdefault(board_id, []).append(pos)
+        self.counts[board_id] = [0] * (2 * self.SIZE) + [sum(numbers)]
+        return board_id
+
+    def retire(self, board_id: int) -> None:
+        """Removes a board, so later draws don't touch it."""
+        for number in self.boards.pop(board_id):
+            positions = self.cells.get(number)
+            if positions is not None:
+                positions.pop(board_id, None)
+        del self.counts[board_id]
+
+    def draw(self, number: int) -> List[Tuple[int, int]]:
+        """Marks a number, and returns the (id, score) of each board that just
+        won, in order of id. Winning boards are retired."""
+        size = self.SIZE
+        winners = []
+        # each number only needs marking once
+        for board_id, positions in self.cells.pop(number, {}).items():
+            counts = self.counts[board_id]
+            won = False
+            for pos in positions:
+                row, col = divmod(pos, size)
+                counts[row] += 1
+                counts[size + col] += 1
+                won |= counts[row] == size or counts[size + col] == size
+            counts[-1] -= number * len(positions)
+            if won:
+                winners.append((board_id, counts[-1] * number))
+        winners.sort()
+        for board_id, _ in winners:
+            self.retire(board_id)
+        return winners
+
+
+@variant(1, "simulate")
+def part_1_simulate(game: Game) -> int:
+    bingo = Bingo(*game)
     for num in bingo.order:
         new_wins = bingo.mark(num)
         if new_wins:
@@ -37,10 +187,37 @@ def part_1(lines: List[str]) -> int:
     return -1
 
 
-def part_2(lines: List[str]) -> int:
-    bingo = Bingo(lines)
+@variant(2, "simulate")
+def part_2_simulate(game: Game) -> int:
+    bingo = Bingo(*game)
     for num in bingo.order:
         new_wins = bingo.mark(num)
         if bingo.boards.shape[0] == 0:
             return new_wins[0]
     return -1
+
+
+@variant(1, "live")
+def part_1_live(game: Game) -> int:
+    order, boards = game
+    bingo = LiveBingo()
+    for board in boards:
+        bingo.add_board(board)
+    for num in order:
+        new_wins = bingo.draw(int(num))
+        if new_wins:
+            return new_wins[0][1]
+    return -1
+
+
+@variant(2, "live")
+def part_2_live(game: Game) -> int:
+    order, boards = game
+    bingo = LiveBingo()
+    for board in boards:
+        bingo.add_board(board)
+    for num in order:
+        new_wins = bingo.draw(int(num))
+        if new_wins and not bingo.boards:
+            return new_wins[0][1]
+    return -1
@@ -1,5 +1,7 @@
 import math
-from typing import Counter, Generator, List, Tuple
+from typing import Counter, Generator, Iterable, Tuple
+
+INPUT_TYPE = "iter"
 
 
 class Line:
@@ -41,7 +43,7 @@ class Line:
         return self.x1 == self.x2
 
 
-def part_1(input_lines: List[str]) -> int:
+def part_1(input_lines: Iterable[str]) -> int:
     line_counts: Counter[Tuple[int, int]] = Counter()
 
     for line in map(Line, input_lines):
@@ -52,7 +54,7 @@ def part_1(input_lines: List[str]) -> int:
     return sum(int(c > 1) for c in line_counts.values())
 
 
-def part_2(input_lines: List[str]) -> int:
+def part_2(input_lines: Iterable[str]) -> int:
     line_counts: Counter[Tuple[int, int]] = Counter()
 
     for line in map(Line, input_lines):
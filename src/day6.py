@@ -1,5 +1,7 @@
 from typing import List
 
+from variants import variant
+
 
 def simulate(initial_timers: List[int], days: int) -> int:
     # number of fish with each timer value (0 - 8, inclusive)
@@ -34,11 +36,23 @@ def simulate_inplace(initial_timers: List[int], days: int) -> int:
     return sum(fish)
 
 
-def part_1(lines: List[str]) -> int:
-    initial_timers = [int(x) for x in lines[0].split(",")]
+def parse(lines: List[str]) -> List[int]:
+    return [int(x) for x in lines[0].split(",")]
+
+
+def part_1(initial_timers: List[int]) -> int:
     return simulate_inplace(initial_timers, 80)
 
 
-def part_2(lines: List[str]) -> int:
-    initial_timers = [int(x) for x in lines[0].split(",")]
+def part_2(initial_timers: List[int]) -> int:
     return simulate_inplace(initial_timers, 256)
+
+
+@variant(1, "simulate")
+def part_1_simulate(initial_timers: List[int]) -> int:
+    return simulate(initial_timers, 80)
+
+
+@variant(2, "simulate")
+def part_2_simulate(initial_timers: List[int]) -> int:
+    return simulate(initial_timers, 256)
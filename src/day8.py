@@ -1,4 +1,4 @@
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, List, Set, Tuple
 
 # 2 segments: 1
 # 3 segments: 7
@@ -54,27 +54,31 @@ def identify_patterns(patterns: List[Set[str]]) -> Dict[str, int]:
     return {"".join(sorted(v)): k for k, v in known.items()}
 
 
-def parse(lines: List[str]) -> Tuple[List[List[Set[str]]], List[List[str]]]:
-    patterns = []
-    digits = []
-    for line in lines:
-        ps, _, ds = line.partition(" | ")
-        patterns.append([set(x) for x in ps.split()])
-        # normalize pattern order
-        digits.append(["".join(sorted(x)) for x in ds.split()])
+INPUT_TYPE = "iter"
+
+Entry = Tuple[List[Set[str]], List[str]]
+
+
+def parse_entry(line: str) -> Entry:
+    ps, _, ds = line.partition(" | ")
+    patterns = [set(x) for x in ps.split()]
+    # normalize pattern order
+    digits = ["".join(sorted(x)) for x in ds.split()]
     return patterns, digits
 
 
-def part_1(lines: List[str]) -> int:
-    _, all_digits = parse(lines)
+def part_1(lines: Iterable[str]) -> int:
+    # the output digits are all we need here
     return sum(
-        int(len(digit) in {2, 3, 4, 7}) for digits in all_digits for digit in digits
+        int(len(digit) in {2, 3, 4, 7})
+        for line in lines
+        for digit in line.partition(" | ")[2].split()
     )
 
 
-def part_2(lines: List[str]) -> int:
+def part_2(lines: Iterable[str]) -> int:
     total = 0
-    for patterns, digits in zip(*parse(lines)):
+    for patterns, digits in map(parse_entry, lines):
         lookup = identify_patterns(patterns)
         total += sum(lookup[digit] * 10 ** i for i, digit in enumerate(digits[::-1]))
     return total
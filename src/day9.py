@@ -1,25 +1,39 @@
-from typing import List, Tuple, cast
+from typing import Tuple, cast
 
 import numpy as np
 import numpy.typing as npt
-from scipy import ndimage
 
+from grid import Buffer, parse_digits
 
-def parse(lines: List[str]) -> Tuple[npt.NDArray[int], npt.NDArray[int], int]:
-    heightmap: npt.NDArray[int] = np.array([list(l) for l in lines], dtype=int)
+INPUT_TYPE = "buffer"
+
+# scipy.ndimage is imported inside the functions that use it, since it takes
+# several times longer to import than numpy
+
+# the heightmap, the label of each cell's basin (0 for the 9s), and the number
+# of basins
+Basins = Tuple[npt.NDArray[np.uint8], npt.NDArray[np.int32], int]
+
+
+def parse(buffer: Buffer) -> Basins:
+    from scipy import ndimage  # pylint: disable=import-outside-toplevel
+
+    heightmap = parse_digits(buffer)
     basins, num_basins = ndimage.label((heightmap != 9).astype(np.uint8))
     return heightmap, basins, num_basins
 
 
-def part_1(lines: List[str]) -> int:
-    heightmap, basins, num_basins = parse(lines)
+def part_1(data: Basins) -> int:
+    from scipy import ndimage  # pylint: disable=import-outside-toplevel
+
+    heightmap, basins, num_basins = data
     # every low point has a basin, and it will be the minimum value in that basin
     mins = ndimage.minimum(heightmap, basins, index=np.arange(1, num_basins + 1))
     return cast(int, np.sum(mins + 1))
 
 
-def part_2(lines: List[str]) -> int:
-    _, basins, num_basins = parse(lines)
+def part_2(data: Basins) -> int:
+    _, basins, num_basins = data
     basin_sizes = [
         np.count_nonzero(basins == label) for label in range(1, num_basins + 1)
     ]
@@ -0,0 +1,57 @@
+"""Fast parsers for rectangular character grids.
+
+These work directly on the raw bytes of the input (see INPUT_TYPE = "buffer"
+in run.py), instead of making a Python string for every cell.
+"""
+
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    import mmap
+
+Buffer = Union[bytes, "mmap.mmap"]
+
+
+def grid_view(buffer: Buffer, start: int = 0, end: int = -1) -> npt.NDArray[np.uint8]:
+    """Returns the characters of the grid in buffer[start:end] as a read-only 2D
+    array of bytes, without copying anything.
+
+    Each row is followed by a newline, except (optionally) the last one.
+    """
+    if end < 0:
+        end = len(buffer)
+    # ignore a trailing newline
+    if end > start and buffer[end - 1 : end] == b"\n":
+        end -= 1
+    if end <= start:
+        return np.zeros((0, 0), dtype=np.uint8)
+    width = buffer.find(b"\n", start, end)
+    if width == -1:
+        width = end
+    width -= start
+    rows, extra = divmod(end - start + 1, width + 1)
+    if extra:
+        raise ValueError("grid rows have different lengths")
+    raw = np.frombuffer(buffer, dtype=np.uint8, count=end - start, offset=start)
+    if rows > 1 and not np.all(raw[width :: width + 1] == ord("\n")):
+        raise ValueError("grid rows have different lengths")
+    return np.lib.stride_tricks.as_strided(
+        raw, shape=(rows, width), strides=(width + 1, 1), writeable=False
+    )
+
+
+def parse_digits(
+    buffer: Buffer, start: int = 0, end: int = -1
+) -> npt.NDArray[np.uint8]:
+    """Parses a grid of single digits."""
+    return grid_view(buffer, start, end) - np.uint8(ord("0"))
+
+
+def parse_bits(
+    buffer: Buffer, start: int = 0, end: int = -1, on: bytes = b"#"
+) -> npt.NDArray[np.bool_]:
+    """Parses a grid of `on` and anything else (usually `#` and `.`)."""
+    return grid_view(buffer, start, end) == ord(on)
@@ -0,0 +1,83 @@
+"""Lightweight instrumentation for the solvers, reported by `run.py --trace`.
+
+Solvers mark phases with `phase()` (as a context manager) or `@timed()` (as a
+decorator), and count events with `count()`. Everything is disabled unless
+run.py calls `enable()`, which has to happen before the day modules are
+imported: `@timed()` returns the function unchanged when it's disabled, and
+`phase()` and `count()` return right away.
+"""
+
+import collections
+import contextlib
+import functools
+import time
+from typing import Any, Callable, ContextManager, Counter, Dict, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+enabled = False
+_phase_times: Dict[str, float] = collections.defaultdict(float)
+_phase_calls: Counter[str] = Counter()
+_counters: Counter[str] = Counter()
+_NULL_PHASE = contextlib.nullcontext()
+
+
+def enable() -> None:
+    global enabled  # pylint: disable=global-statement
+    enabled = True
+
+
+def reset() -> None:
+    _phase_times.clear()
+    _phase_calls.clear()
+    _counters.clear()
+
+
+@contextlib.contextmanager
+def _timed_phase(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phase_times[name] += time.perf_counter() - start
+        _phase_calls[name] += 1
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Times the body of a `with` block."""
+    if not enabled:
+        return _NULL_PHASE
+    return _timed_phase(name)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Times every call to the decorated function."""
+
+    def decorator(func: F) -> F:
+        if not enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _timed_phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+def count(name: str, n: int = 1) -> None:
+    if enabled:
+        _counters[name] += n
+
+
+def results() -> Dict[str, Any]:
+    """Returns the phase times and counters recorded since the last reset()."""
+    return {
+        "phases": {
+            name: {"time": _phase_times[name], "calls": calls}
+            for name, calls in _phase_calls.items()
+        },
+        "counters": dict(_counters),
+    }
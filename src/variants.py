@@ -0,0 +1,28 @@
+"""A registry of alternative implementations of the parts of each day.
+
+Variants take the same input as the part they replace, and are checked and
+benchmarked against it by `run.py --variants`.
+"""
+
+from typing import Any, Callable, Dict, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# module name -> part -> variant name -> function
+_registry: Dict[str, Dict[int, Dict[str, Callable[[Any], Any]]]] = {}
+
+
+def variant(part: int, name: str) -> Callable[[F], F]:
+    """Registers the decorated function as another way to solve `part` of the
+    day it's defined in."""
+
+    def decorator(func: F) -> F:
+        parts = _registry.setdefault(func.__module__, {})
+        parts.setdefault(part, {})[name] = func
+        return func
+
+    return decorator
+
+
+def get_variants(module: str) -> Dict[int, Dict[str, Callable[[Any], Any]]]:
+    return _registry.get(module, {})